@@ -0,0 +1,31 @@
+import time
+import tracemalloc
+
+from load.load import Load
+
+
+def measure(func, *args):
+    """Tiempo sin trazas y, en una segunda ejecución, pico de memoria con tracemalloc"""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 ** 2
+
+
+def timed_load(df, db_path, **settings):
+    """Segundos de Load.load_to_database sobre una base nueva en db_path, con los Settings indicados"""
+    loader = Load(df)
+    loader.config.DB_NAME = db_path
+    for name, value in settings.items():
+        setattr(loader.config, name, value)
+    start = time.perf_counter()
+    if not loader.load_to_database():
+        raise RuntimeError(f"La carga falló con {settings}")
+    elapsed = time.perf_counter() - start
+    # Cerrar las conexiones del pool: el archivo queda completo para medirlo o borrarlo
+    loader.engine.dispose()
+    return elapsed
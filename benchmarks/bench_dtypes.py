@@ -0,0 +1,47 @@
+"""Benchmark: memoria del DataFrame transformado con tipos por defecto vs. COMPACT_DTYPES y LAZY_ALL_TITLES.
+
+Uso: python -m benchmarks.bench_dtypes [filas]
+"""
+import sys
+import time
+
+from benchmarks.synthetic import make_headlines_frame
+from config.settings import Settings
+from transform.dtypes import column_memory, memory_report, print_memory_report
+from transform.transform import Transform
+
+
+def transform_with(df, **settings):
+    """Transform.clean con atributos de Settings sobrescritos solo durante la llamada"""
+    previous = {name: getattr(Settings, name) for name in settings}
+    for name, value in settings.items():
+        setattr(Settings, name, value)
+    try:
+        start = time.perf_counter()
+        result = Transform(df).clean(verbose=False)
+        return result, time.perf_counter() - start
+    finally:
+        for name, value in previous.items():
+            setattr(Settings, name, value)
+
+
+def main(rows=100000):
+    df = make_headlines_frame(rows)
+    print(f"📊 Benchmark de tipos compactos: {rows} filas")
+
+    default, default_time = transform_with(df, COMPACT_DTYPES=False, LAZY_ALL_TITLES=False)
+    # Medir antes de compactar otra copia: la conversión a pyarrow altera el tamaño aparente de los str
+    default_memory = column_memory(default)
+    compact, compact_time = transform_with(df, COMPACT_DTYPES=True, LAZY_ALL_TITLES=False)
+    lazy, lazy_time = transform_with(df, COMPACT_DTYPES=True, LAZY_ALL_TITLES=True)
+
+    print_memory_report(memory_report(default_memory, column_memory(compact)))
+    for name, result, elapsed in [('por defecto', default, default_time),
+                                  ('compacto', compact, compact_time),
+                                  ('compacto + AllTitles diferido', lazy, lazy_time)]:
+        total_mb = result.memory_usage(index=False, deep=True).sum() / 1024 ** 2
+        print(f"   · {name:<30} {total_mb:8.1f} MB  transformación {elapsed:6.2f} s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
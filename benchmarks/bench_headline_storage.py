@@ -0,0 +1,90 @@
+"""Benchmark: tamaño de la base y tiempo de carga con titulares en la tabla ancha vs. normalizados.
+
+Una fracción de las celdas Top1-Top25 se reemplaza por titulares de un
+conjunto pequeño que se repite entre días y columnas, como en las noticias
+reales. Se compara:
+
+- la transformación con y sin INTERN_HEADLINES (memoria de los textos distintos);
+- la carga masiva con HEADLINE_STORAGE 'wide' y 'normalized', con y sin el
+  índice FTS5 de titulares (HEADLINE_SEARCH).
+
+Uso: python -m benchmarks.bench_headline_storage [filas] [fracción repetida]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks._util import timed_load
+from benchmarks.synthetic import make_headlines_frame
+from config.settings import Settings
+from transform.transform import Transform
+
+
+def with_repeats(df, repeat_share, pool_size=2000, seed=0):
+    """Reemplazar una fracción de las celdas de noticias por titulares de un conjunto que se repite"""
+    rng = np.random.default_rng(seed)
+    news_columns = [col for col in df.columns if col.startswith('Top')]
+    pool = df[news_columns].stack().drop_duplicates().sample(pool_size, random_state=seed).to_numpy()
+    for col in news_columns:
+        repeated = rng.random(len(df)) < repeat_share
+        df.loc[repeated, col] = rng.choice(pool, size=int(repeated.sum()))
+    return df
+
+
+def text_memory_mb(df):
+    """Memoria de los objetos str distintos de las columnas de noticias (las celdas internadas comparten objeto)"""
+    news_columns = [col for col in df.columns if col.startswith('Top')]
+    objects = {id(value): value for value in df[news_columns].to_numpy().ravel() if isinstance(value, str)}
+    return sum(sys.getsizeof(value) for value in objects.values()) / 1024 ** 2
+
+
+def timed_transform(df, intern):
+    previous = Settings.INTERN_HEADLINES
+    Settings.INTERN_HEADLINES = intern
+    try:
+        start = time.perf_counter()
+        result = Transform(df).clean(verbose=False)
+        return result, time.perf_counter() - start
+    finally:
+        Settings.INTERN_HEADLINES = previous
+
+
+def main(rows=50000, repeat_share=0.5):
+    df = with_repeats(make_headlines_frame(rows), repeat_share)
+    news = df[[col for col in df.columns if col.startswith('Top')]].stack()
+    print(f"📊 Benchmark de almacenamiento de titulares: {rows} filas, {len(news)} titulares, "
+          f"{news.nunique()} distintos ({1 - news.nunique() / len(news):.0%} repetidos)")
+
+    plain, plain_time = timed_transform(df, intern=False)
+    interned, interned_time = timed_transform(df, intern=True)
+    print("   Transformación:")
+    for name, result, elapsed in [('sin internar', plain, plain_time), ('INTERN_HEADLINES', interned, interned_time)]:
+        print(f"   · {name:<18} {elapsed:6.2f} s  texto de noticias en memoria {text_memory_mb(result):7.1f} MB")
+
+    scenarios = [
+        ('ancho', {'HEADLINE_STORAGE': 'wide', 'HEADLINE_SEARCH': False}),
+        ('normalizado', {'HEADLINE_STORAGE': 'normalized', 'HEADLINE_SEARCH': False}),
+        ('ancho + FTS5', {'HEADLINE_STORAGE': 'wide', 'HEADLINE_SEARCH': True}),
+        ('normalizado + FTS5', {'HEADLINE_STORAGE': 'normalized', 'HEADLINE_SEARCH': True}),
+    ]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i, (name, settings) in enumerate(scenarios):
+            db_path = os.path.join(tmp_dir, f'bench_{i}.db')
+            elapsed = timed_load(interned, db_path, BULK_LOAD=True, **settings)
+            results.append((name, elapsed, os.path.getsize(db_path) / 1024 ** 2))
+
+    print("   Carga masiva a SQLite:")
+    for i, (name, elapsed, size_mb) in enumerate(results):
+        # Cada variante normalizada se compara con la ancha de su mismo par (sin y con FTS5)
+        _, wide_time, wide_mb = results[i - i % 2]
+        print(f"   · {name:<20} {elapsed:6.2f} s ({wide_time / elapsed:.2f}x)  "
+              f"{size_mb:7.1f} MB ({size_mb / wide_mb:.0%} del ancho)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 0.5)
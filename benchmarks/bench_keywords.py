@@ -0,0 +1,54 @@
+"""Benchmark: conteo de palabras clave con tres pasadas por subcadena vs. una pasada por palabra completa.
+
+Uso: python -m benchmarks.bench_keywords [filas]
+"""
+import sys
+import time
+
+from benchmarks.synthetic import make_headlines_frame
+from transform.features import title_features
+from transform.keywords import DEFAULT_LEXICONS, KeywordMatcher
+
+
+def legacy_keyword_counts(all_titles):
+    """Implementación original de Transform.clean (paso 7)"""
+    counts = {}
+    for col_name, keyword_list in DEFAULT_LEXICONS.items():
+        counts[col_name] = all_titles.str.lower().str.count('|'.join(keyword_list))
+    return counts
+
+
+def main(rows=100000):
+    df = make_headlines_frame(rows)
+    news_columns = [col for col in df.columns if col.startswith('Top')]
+    all_titles = title_features(df, news_columns)[0]['AllTitles']
+    print(f"📊 Benchmark de palabras clave: {rows} filas, {len(DEFAULT_LEXICONS)} léxicos")
+
+    start = time.perf_counter()
+    legacy = legacy_keyword_counts(all_titles)
+    legacy_time = time.perf_counter() - start
+
+    substring_matcher = KeywordMatcher(whole_word=False)
+    start = time.perf_counter()
+    substring = substring_matcher.count(all_titles)
+    substring_time = time.perf_counter() - start
+
+    whole_word_matcher = KeywordMatcher(whole_word=True)
+    start = time.perf_counter()
+    whole_word = whole_word_matcher.count(all_titles)
+    whole_word_time = time.perf_counter() - start
+
+    for col_name in DEFAULT_LEXICONS:
+        assert substring[col_name].equals(legacy[col_name])
+
+    print(f"   - original (3 pasadas, subcadenas):      {legacy_time:.2f} s")
+    print(f"   - motor, subcadenas (compatible):        {substring_time:.2f} s")
+    print(f"   - motor, palabra completa (1 pasada):    {whole_word_time:.2f} s "
+          f"({legacy_time / whole_word_time:.1f}x)")
+    print("   - coincidencias totales (original -> palabra completa):")
+    for col_name in DEFAULT_LEXICONS:
+        print(f"     • {col_name}: {legacy[col_name].sum()} -> {whole_word[col_name].sum()}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
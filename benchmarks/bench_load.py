@@ -0,0 +1,38 @@
+"""Benchmark: filas/segundo cargando a SQLite con to_sql(method='multi') vs. carga masiva con executemany.
+
+Uso: python -m benchmarks.bench_load [filas]
+"""
+import os
+import sys
+import tempfile
+
+from benchmarks._util import timed_load
+from benchmarks.synthetic import make_headlines_frame
+from transform.transform import Transform
+
+
+def main(rows=50000):
+    df = Transform(make_headlines_frame(rows)).clean(verbose=False)
+    print(f"📊 Benchmark de carga a SQLite: {len(df)} filas transformadas")
+
+    scenarios = [
+        ("to_sql(method='multi')", {'BULK_LOAD': False}),
+        ("executemany, WAL + NORMAL", {'BULK_LOAD': True, 'SQLITE_JOURNAL_MODE': 'WAL',
+                                       'SQLITE_SYNCHRONOUS': 'NORMAL'}),
+        ("executemany, DELETE + FULL", {'BULK_LOAD': True, 'SQLITE_JOURNAL_MODE': 'DELETE',
+                                        'SQLITE_SYNCHRONOUS': 'FULL'}),
+    ]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i, (name, settings) in enumerate(scenarios):
+            elapsed = timed_load(df, os.path.join(tmp_dir, f'bench_{i}.db'), **settings)
+            results.append((name, elapsed))
+
+    baseline = results[0][1]
+    for name, elapsed in results:
+        print(f"   - {name:<28} {elapsed:6.2f} s  {len(df) / elapsed:9.0f} filas/s  "
+              f"({baseline / elapsed:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
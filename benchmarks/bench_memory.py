@@ -0,0 +1,95 @@
+"""Benchmark: memoria pico de Transform.clean y de la preparación de la carga, antes y después de evitar copias.
+
+La versión original copia el DataFrame completo, procesa el texto de todas
+las filas y luego filtra, reordena y reindexa (cada paso crea otro
+DataFrame). La actual filtra duplicados y faltantes primero y arma el
+resultado una sola vez. El pico se mide con tracemalloc y se informa
+también en relación con el tamaño del DataFrame crudo.
+
+Uso: python -m benchmarks.bench_memory [filas] [fracción de duplicados]
+"""
+import sys
+
+import pandas as pd
+
+from benchmarks._util import measure
+from benchmarks.synthetic import make_headlines_frame
+from load.load import Load
+from transform.features import title_features
+from transform.keywords import KeywordMatcher, load_lexicons
+from transform.normalize import normalize_news_columns
+from transform.transform import Transform
+
+
+def legacy_clean(df):
+    """Implementación original de Transform.clean: copia inicial y texto procesado antes de filtrar"""
+    df = df.copy()
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    df['Year'] = df['Date'].dt.year
+    df['Month'] = df['Date'].dt.month
+    df['Day'] = df['Date'].dt.day
+    df['DayOfWeek'] = df['Date'].dt.day_name()
+    df['Label'] = pd.to_numeric(df['Label'], errors='coerce').astype('Int64')
+    df['Sentiment'] = df['Label'].map({0: 'Negativo', 1: 'Positivo'})
+
+    news_columns = [col for col in df.columns if col.startswith('Top')]
+    news = normalize_news_columns(df[news_columns], news_columns)
+    features, _ = title_features(news, news_columns)
+    keyword_counts = KeywordMatcher(load_lexicons(None)).count(features['AllTitles'])
+    for col in news_columns:
+        df[col] = news[col]
+    df['ValidTitles'] = features['ValidTitles']
+    df['AllTitles'] = features['AllTitles']
+    df['AvgTitleLength'] = features['AvgTitleLength']
+
+    df = df.drop_duplicates(subset=['Date', 'Label'])
+    df = df.dropna(subset=['Date', 'Label'])
+    for col in keyword_counts.columns:
+        df[col] = keyword_counts[col]
+    preferred_order = [
+        'Date', 'Year', 'Month', 'Day', 'DayOfWeek', 'Label', 'Sentiment',
+        'ValidTitles', 'AvgTitleLength', 'FinancialKeywords', 'PositiveKeywords', 'NegativeKeywords'
+    ] + news_columns + ['AllTitles']
+    df = df[[c for c in preferred_order if c in df.columns]]
+    return df.reset_index(drop=True)
+
+
+def legacy_prepare_for_database(df):
+    """Implementación original de Load._prepare_for_database seguida de _database_records"""
+    df_to_load = df.rename(columns=Load.COLUMN_MAPPING)
+    df_to_load = df_to_load[[col for col in Load.COLUMN_MAPPING.values() if col in df_to_load.columns]]
+    records = df_to_load.astype(object)
+    records['date'] = pd.to_datetime(df_to_load['date']).dt.strftime(Load.DATE_FORMAT)
+    records = records.where(records.notna(), None)
+    records['row_hash'] = pd.util.hash_pandas_object(records, index=False).map('{:016x}'.format)
+    return records
+
+
+def main(rows=50000, duplicate_share=0.1):
+    df = make_headlines_frame(rows)
+    # Fechas repetidas para que el filtrado temprano tenga filas que descartar
+    duplicates = df.sample(frac=duplicate_share, random_state=0)
+    df = pd.concat([df, duplicates], ignore_index=True)
+    input_mb = df.memory_usage(index=False, deep=True).sum() / 1024 ** 2
+    print(f"📊 Benchmark de memoria pico: {len(df)} filas crudas ({input_mb:.0f} MB, "
+          f"{len(duplicates)} duplicadas)")
+
+    legacy, legacy_time, legacy_peak = measure(legacy_clean, df)
+    current, current_time, current_peak = measure(lambda frame: Transform(frame).clean(verbose=False), df)
+    pd.testing.assert_frame_equal(legacy, current)
+    loader = Load(current)
+    _, legacy_load_time, legacy_load_peak = measure(legacy_prepare_for_database, current)
+    _, load_time, load_peak = measure(lambda frame: loader._database_records(loader._prepare_for_database(frame)),
+                                        current)
+
+    print(f"   {'etapa':<34} {'tiempo':>8} {'pico':>10} {'pico/entrada':>13}")
+    for name, elapsed, peak in [('Transform.clean original', legacy_time, legacy_peak),
+                                ('Transform.clean sin copias', current_time, current_peak),
+                                ('preparación de la carga original', legacy_load_time, legacy_load_peak),
+                                ('preparación de la carga actual', load_time, load_peak)]:
+        print(f"   {name:<34} {elapsed:6.2f} s {peak:7.0f} MB {peak / input_mb:12.2f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 0.1)
@@ -0,0 +1,65 @@
+"""Benchmark: tamaño y tiempos de escritura/lectura del CSV limpio frente a Parquet y Feather.
+
+Uso: python -m benchmarks.bench_output [filas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_headlines_frame
+from load.columnar import ColumnarWriter, read_columnar
+from transform.transform import Transform
+
+# Columnas que lee la etapa de gráficas (lectura parcial)
+GRAPH_COLUMNS = ['Date', 'Year', 'DayOfWeek', 'Label', 'Sentiment', 'ValidTitles',
+                 'AvgTitleLength', 'FinancialKeywords', 'PositiveKeywords', 'NegativeKeywords']
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def write_columnar(df, path, fmt, compression):
+    with ColumnarWriter(path, fmt, compression=compression, row_group_size=100000) as writer:
+        writer.write(df)
+
+
+def main(rows=50000):
+    df = Transform(make_headlines_frame(rows)).clean(verbose=False)
+    print(f"📊 Benchmark de formatos de salida: {len(df)} filas transformadas")
+
+    scenarios = [
+        ('CSV', 'csv', None),
+        ('Parquet snappy', 'parquet', 'snappy'),
+        ('Parquet zstd', 'parquet', 'zstd'),
+        ('Feather sin compresión', 'feather', None),
+        ('Feather lz4', 'feather', 'lz4'),
+        ('Feather zstd', 'feather', 'zstd'),
+    ]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i, (name, fmt, compression) in enumerate(scenarios):
+            path = os.path.join(tmp_dir, f'bench_{i}.{fmt}')
+            if fmt == 'csv':
+                write_time = timed(lambda: df.to_csv(path, index=False))
+                read_time = timed(lambda: pd.read_csv(path, parse_dates=['Date']))
+                partial_time = timed(lambda: pd.read_csv(path, usecols=GRAPH_COLUMNS, parse_dates=['Date']))
+            else:
+                write_time = timed(lambda: write_columnar(df, path, fmt, compression))
+                read_time = timed(lambda: read_columnar(path))
+                partial_time = timed(lambda: read_columnar(path, columns=GRAPH_COLUMNS))
+            results.append((name, os.path.getsize(path), write_time, read_time, partial_time))
+
+    print(f"   {'formato':<24} {'tamaño':>9} {'escritura':>10} {'lectura':>9} {'columnas EDA':>13}")
+    for name, size, write_time, read_time, partial_time in results:
+        print(f"   {name:<24} {size / 1e6:7.1f} MB {write_time:8.2f} s {read_time:7.2f} s "
+              f"{partial_time:11.3f} s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,183 @@
+"""Benchmark del pipeline completo (Extract, Transform.clean y Load) sobre CSV sintéticos.
+
+Genera datasets Date/Label/Top1-Top25 de 10k a 10M filas, ejecuta las tres
+fases y registra por etapa tiempo, CPU, filas/s y memoria, además de una
+serie de memoria residente a lo largo de la ejecución. Los resultados se
+guardan en JSON para comparar ejecuciones.
+
+Uso:
+    python -m benchmarks.bench_pipeline --sizes 10k,100k,1m
+    python -m benchmarks.bench_pipeline --sizes 10m --streaming --chunk-size 200000
+    python -m benchmarks.bench_pipeline --sizes 100k --distribution zipf --keyword-share 0.2
+    python -m benchmarks.bench_pipeline --sizes 1m --set BULK_LOAD=True --set TRANSFORM_WORKERS=4
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from benchmarks.synthetic import write_headlines_csv
+from config.settings import Settings
+from extract.extract import Extract
+from load.database import DatabaseManager
+from load.load import Load
+from monitoring.profiler import StageProfiler, current_rss_mb
+from transform.transform import Transform
+
+
+def parse_size(text):
+    """'10k' -> 10000, '2.5m' -> 2500000"""
+    text = text.strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+
+class MemorySampler(threading.Thread):
+    """Muestrea la memoria residente cada `interval` segundos en un hilo aparte"""
+
+    def __init__(self, interval=0.5):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+        self._start = time.perf_counter()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            rss = current_rss_mb()
+            if rss is not None:
+                self.samples.append((round(time.perf_counter() - self._start, 2), round(rss, 1)))
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        return self.samples
+
+
+def parse_overrides(pairs):
+    """['BULK_LOAD=True', 'TRANSFORM_WORKERS=4'] -> {'BULK_LOAD': True, 'TRANSFORM_WORKERS': 4}"""
+    overrides = {}
+    for pair in pairs:
+        name, value = pair.split('=', 1)
+        try:
+            overrides[name] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            overrides[name] = value
+    return overrides
+
+
+def run_pipeline(csv_path, db_path, streaming=False, chunk_size=100000):
+    """Ejecutar Extract, Transform y Load sobre csv_path y devolver el informe del profiler"""
+    profiler = StageProfiler()
+    config = Settings()
+    config.DB_NAME = db_path
+    extractor = Extract(csv_path)
+    transformer = Transform(profiler=profiler)
+    loader = Load(config=config)
+    output_path = os.path.splitext(db_path)[0] + '.csv'
+
+    if streaming:
+        stage = profiler.begin('etl_stream')
+        chunks = transformer.clean_chunks(extractor.extract_chunks(chunk_size))
+        if not loader.load_stream(chunks, output_path):
+            raise RuntimeError("La carga por lotes falló")
+        profiler.end(stage, rows=extractor.rows_extracted)
+    else:
+        stage = profiler.begin('extract')
+        df = extractor.extract()
+        if df is None:
+            raise RuntimeError(f"No se pudo extraer {csv_path}")
+        profiler.end(stage, rows=len(df))
+        transformer.df = df
+        with profiler.stage('transform', rows=len(df)):
+            df = transformer.clean(verbose=False)
+        loader.df = df
+        with profiler.stage('load.csv', rows=len(df)):
+            loader.save_clean_csv(output_path)
+        with profiler.stage('load.database', rows=len(df)):
+            if not loader.load_to_database():
+                raise RuntimeError("La carga a la base de datos falló")
+    DatabaseManager.dispose_all()
+    return profiler.report(rows_extracted=extractor.rows_extracted,
+                           rows_transformed=transformer.rows_transformed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10k,100k', help="tamaños separados por coma (10k ... 10m)")
+    parser.add_argument('--streaming', action='store_true', help="usar el modo por lotes (necesario para 10M)")
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--distribution', default='uniform', choices=['uniform', 'zipf'])
+    parser.add_argument('--keyword-share', type=float, default=None,
+                        help="fracción esperada de palabras clave en los títulos")
+    parser.add_argument('--missing-rate', type=float, default=0.03)
+    parser.add_argument('--words', default='3-14', help="rango de palabras por título, p. ej. 3-14")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=None, help="reutilizar los CSV generados en este directorio")
+    parser.add_argument('--set', action='append', default=[], metavar='CLAVE=VALOR',
+                        help="sobrescribir Settings, p. ej. --set BULK_LOAD=True (repetible)")
+    parser.add_argument('--output', default='output/benchmarks/pipeline.json')
+    args = parser.parse_args()
+
+    # Las etapas crean sus propias instancias de Settings: se sobrescribe la clase
+    overrides = parse_overrides(args.set)
+    for name, value in overrides.items():
+        if not hasattr(Settings, name):
+            parser.error(f"Settings no tiene el atributo {name}")
+        setattr(Settings, name, value)
+
+    min_words, max_words = (int(n) for n in args.words.split('-'))
+    options = {'distribution': args.distribution, 'keyword_share': args.keyword_share,
+               'missing_rate': args.missing_rate, 'min_words': min_words, 'max_words': max_words}
+    results = {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'streaming': args.streaming,
+        'dataset': dict(options, seed=args.seed),
+        'settings': overrides,
+        'runs': [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir or tmp_dir
+        os.makedirs(data_dir, exist_ok=True)
+        for size in map(parse_size, args.sizes.split(',')):
+            name = f"headlines_{size}_{args.distribution}_{args.keyword_share}_{args.seed}_{args.words}.csv"
+            csv_path = os.path.join(data_dir, name)
+            if not os.path.exists(csv_path):
+                print(f"🧪 Generando {size} filas sintéticas en {csv_path}...")
+                write_headlines_csv(csv_path, size, seed=args.seed, **options)
+
+            print(f"📊 Ejecutando pipeline con {size} filas...")
+            sampler = MemorySampler()
+            sampler.start()
+            report = run_pipeline(csv_path, os.path.join(tmp_dir, f'bench_{size}.db'),
+                                  streaming=args.streaming, chunk_size=args.chunk_size)
+            report['rows'] = size
+            report['input_mb'] = round(os.path.getsize(csv_path) / 1024 ** 2, 1)
+            report['memory_timeline'] = sampler.stop()
+            results['runs'].append(report)
+
+            for stage in report['stages']:
+                if '.' not in stage['stage'] or stage['stage'].startswith('load.'):
+                    print(f"   - {stage['stage']:<14} {stage['wall_s']:8.2f} s  "
+                          f"{stage.get('rows_per_s', 0):10.0f} filas/s  "
+                          f"pico {stage['peak_memory_mb'] or 0:8.1f} MB")
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Resultados guardados en {args.output}")
+
+
+if __name__ == '__main__':
+    main()
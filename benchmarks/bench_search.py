@@ -0,0 +1,94 @@
+"""Benchmark: latencia de búsqueda de titulares con el índice FTS5 vs. LIKE '%término%' (recorrido de la tabla).
+
+La tabla sentiment_analysis se llena directamente con texto sintético, sin
+pasar por Transform, para llegar a millones de filas en poco tiempo. Cada
+fila lleva `palabras` palabras de titulares y, con baja probabilidad, un
+término poco frecuente (como las búsquedas puntuales de los analistas); el
+término común muestra el caso en que ambos métodos devuelven muchas filas.
+
+Uso: python -m benchmarks.bench_search [filas] [palabras por fila]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import VOCABULARY
+from load.load import Load
+
+# Términos poco frecuentes y probabilidad de que aparezcan en una fila
+RARE_TERMS = {'Fukushima': 1e-5, 'Lehman': 1e-4, 'Brexit': 1e-3}
+COMMON_TERM = 'crash'
+
+
+def fill_table(loader, rows, words, batch_rows=100000, seed=0):
+    """Insertar filas sintéticas (fecha, etiqueta, sentimiento y all_titles) por lotes"""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(VOCABULARY, dtype=object)
+    insert_sql = ("INSERT INTO sentiment_analysis (date, year, label, sentiment, all_titles) "
+                  "VALUES (?, ?, ?, ?, ?)")
+    connection = loader.engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for offset in range(0, rows, batch_rows):
+            n = min(batch_rows, rows - offset)
+            dates = pd.date_range(pd.Timestamp('2000-01-03') + pd.Timedelta(minutes=offset), periods=n, freq='min')
+            labels = rng.integers(0, 2, size=n)
+            titles = [' '.join(row) for row in rng.choice(vocabulary, size=(n, words))]
+            for term, probability in RARE_TERMS.items():
+                for i in np.flatnonzero(rng.random(n) < probability):
+                    titles[i] += ' ' + term
+            cursor.executemany(insert_sql, zip(dates.strftime(Load.DATE_FORMAT), dates.year.tolist(),
+                                               labels.tolist(), np.where(labels == 1, 'Positivo', 'Negativo').tolist(),
+                                               titles))
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def timed_search(loader, term, method, repeats=3):
+    """Mejor tiempo de varias búsquedas (la primera calienta la caché de páginas)"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = loader.search_headlines(term, method=method)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(result), best
+
+
+def main(rows=2000000, words=40):
+    print(f"📊 Benchmark de búsqueda de titulares: {rows} filas, {words} palabras por fila")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        loader = Load()
+        loader.config.DB_NAME = os.path.join(tmp_dir, 'bench_search.db')
+        loader.config.HEADLINE_SEARCH = True
+        loader.create_table()
+
+        start = time.perf_counter()
+        fill_table(loader, rows, words)
+        fill_time = time.perf_counter() - start
+        table_mb = os.path.getsize(loader.config.DB_NAME) / 1024 ** 2
+
+        start = time.perf_counter()
+        with loader.engine.begin() as conn:
+            loader._refresh_headline_index(conn)
+        index_time = time.perf_counter() - start
+        index_mb = os.path.getsize(loader.config.DB_NAME) / 1024 ** 2 - table_mb
+        print(f"   Tabla: {table_mb:.0f} MB en {fill_time:.1f} s; índice FTS5: {index_mb:.0f} MB en {index_time:.1f} s")
+
+        print(f"   {'término':<12} {'filas FTS5':>11} {'filas LIKE':>11} {'FTS5':>10} {'LIKE':>10} {'aceleración':>12}")
+        for term in [*RARE_TERMS, COMMON_TERM]:
+            fts_rows, fts_time = timed_search(loader, term, 'fts')
+            like_rows, like_time = timed_search(loader, term, 'like')
+            print(f"   {term:<12} {fts_rows:>11} {like_rows:>11} {fts_time * 1000:7.1f} ms {like_time * 1000:7.1f} ms "
+                  f"{like_time / fts_time:11.1f}x")
+        loader.engine.dispose()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 40)
@@ -0,0 +1,84 @@
+"""Benchmark: obtener la matriz documento-término re-tokenizando AllTitles del CSV vs. abrir el archivo mapeado.
+
+Los trabajos de modelado leían el CSV limpio y volvían a tokenizar AllTitles
+fila a fila (Counter y vocabulario en dicts) para armar una matriz CSR. Aquí
+se compara eso con abrir el archivo de TermMatrixBuilder, con vocabulario y
+con hashing trick, y recorrer sus valores TF-IDF. También se informa el costo
+de construir el archivo dentro de la carga. La memoria es el pico de
+tracemalloc: las páginas del archivo mapeado no cuentan, las lee el sistema
+operativo bajo demanda.
+
+Uso: python -m benchmarks.bench_term_matrix [filas] [columnas del hashing]
+"""
+import os
+import sys
+import tempfile
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._util import measure
+from benchmarks.synthetic import make_headlines_frame
+from transform.term_matrix import TOKEN_PATTERN, TermMatrixBuilder, load_term_matrix
+from transform.transform import Transform
+
+
+def retokenize_csv(csv_path):
+    """Versión de los trabajos de modelado: leer el CSV y tokenizar AllTitles fila a fila"""
+    from scipy.sparse import csr_matrix
+    df = pd.read_csv(csv_path, usecols=['Date', 'Label', 'AllTitles'], parse_dates=['Date'])
+    vocabulary, indptr, indices, counts = {}, [0], [], []
+    for text in df['AllTitles'].fillna('').str.lower():
+        for term, count in Counter(TOKEN_PATTERN.findall(text)).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+        indptr.append(len(indices))
+    matrix = csr_matrix((counts, indices, indptr), shape=(len(df), len(vocabulary)))
+    return matrix, df['Label'].to_numpy()
+
+
+def open_term_matrix(path):
+    """Abrir el archivo y recorrer el TF-IDF completo (fuerza la lectura de las páginas)"""
+    matrix = load_term_matrix(path)
+    csr = matrix.to_scipy('tfidf')
+    csr.sum()
+    return csr, matrix.labels
+
+
+def build(df, path, n_features):
+    builder = TermMatrixBuilder(path, n_features=n_features)
+    builder.add_frame(df)
+    return builder.finish()
+
+
+def main(rows=100000, n_features=2 ** 18):
+    df = Transform(make_headlines_frame(rows)).clean(verbose=False)
+    print(f"📊 Benchmark de matriz documento-término: {len(df)} filas, hashing de {n_features} columnas")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'clean.csv')
+        df.to_csv(csv_path, index=False)
+        paths = {'vocabulario': os.path.join(tmp_dir, 'vocabulary.bin'),
+                 'hashing': os.path.join(tmp_dir, 'hashing.bin')}
+
+        print("   Construcción durante la carga:")
+        for name, path in paths.items():
+            _, elapsed, peak = measure(build, df, path, None if name == 'vocabulario' else n_features)
+            print(f"   · {name:<12} {elapsed:6.2f} s  pico {peak:7.1f} MB  "
+                  f"archivo {os.path.getsize(path) / 1024 ** 2:7.1f} MB")
+
+        print("   Lectura en el trabajo de modelado:")
+        (baseline, _), base_time, base_peak = measure(retokenize_csv, csv_path)
+        print(f"   · {'re-tokenizar CSV':<22} {base_time:6.2f} s  pico {base_peak:7.1f} MB  "
+              f"{baseline.shape[0]}x{baseline.shape[1]}, {baseline.nnz} no nulos")
+        for name, path in paths.items():
+            (csr, _), elapsed, peak = measure(open_term_matrix, path)
+            print(f"   · {'archivo ' + name:<22} {elapsed:6.2f} s  pico {peak:7.1f} MB  "
+                  f"{csr.shape[0]}x{csr.shape[1]}, {csr.nnz} no nulos ({base_time / elapsed:.0f}x)")
+            del csr
+        assert np.array_equal(np.diff(baseline.indptr), np.diff(load_term_matrix(paths['vocabulario']).indptr))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 2 ** 18)
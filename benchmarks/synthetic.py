@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+# Palabras clave de los léxicos mezcladas con palabras de relleno, como en titulares reales
+KEYWORDS = [
+    'stock', 'market', 'trading', 'price', 'earnings', 'revenue', 'profit', 'loss',
+    'investor', 'bank', 'economy', 'rise', 'gain', 'up', 'support', 'growth', 'surge',
+    'rally', 'fall', 'drop', 'down', 'crisis', 'crash', 'plunge', 'weak', 'trouble',
+]
+FILLER = [
+    'government', 'president', 'police', 'war', 'election', 'oil', 'China', 'U.S.',
+    'the', 'of', 'to', 'in', 'a', 'for', 'on', 'says', 'after', 'over', 'new', 'with',
+    'Russia', 'Israel', 'minister', 'people', 'killed', 'court', 'world', 'first', 'year',
+    'years', 'state', 'country', 'report', 'president', 'military', 'law', 'children',
+    'million', 'protest', 'attack', 'security', 'official', 'leader', 'group', 'nuclear',
+    'Iran', 'Syria', 'EU', 'UN', 'Greece', 'Europe', 'India', 'video', 'health', 'could',
+    "Obama's", '"leaked"', '(update)', '#breaking', '@news', '£', '€', '-', ';', 'Café',
+]
+VOCABULARY = KEYWORDS + FILLER * 4
+
+
+def word_probabilities(distribution='uniform', keyword_share=None):
+    """Vocabulario y probabilidades de cada palabra para los titulares sintéticos.
+
+    'uniform' sortea sobre VOCABULARY (el relleno aparece 4 veces); 'zipf'
+    pondera cada palabra por 1/rango, como el texto real. keyword_share fija
+    la fracción esperada de palabras clave de los léxicos.
+    """
+    if distribution == 'uniform' and keyword_share is None:
+        return np.array(VOCABULARY, dtype=object), None
+    vocabulary = np.array(KEYWORDS + FILLER, dtype=object)
+    if distribution == 'zipf':
+        weights = 1.0 / np.arange(1, len(vocabulary) + 1)
+        # Rangos intercalados para que las palabras clave no queden todas al principio
+        weights = np.random.default_rng(0).permutation(weights)
+    elif distribution == 'uniform':
+        weights = np.ones(len(vocabulary))
+    else:
+        raise ValueError(f"Distribución desconocida: {distribution} (use 'uniform' o 'zipf')")
+    if keyword_share is not None:
+        is_keyword = np.arange(len(vocabulary)) < len(KEYWORDS)
+        weights = np.where(is_keyword, weights / weights[is_keyword].sum() * keyword_share,
+                           weights / weights[~is_keyword].sum() * (1 - keyword_share))
+    return vocabulary, weights / weights.sum()
+
+
+def make_headlines_frame(rows, seed=0, missing_rate=0.03, min_words=3, max_words=14,
+                         distribution='uniform', keyword_share=None, start=0):
+    """Generar un DataFrame crudo con Date, Label y Top1-Top25 como el CSV de entrada.
+
+    start desplaza las fechas (en minutos) para generar lotes consecutivos sin claves repetidas.
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary, probabilities = word_probabilities(distribution, keyword_share)
+    # Fechas únicas por minuto: los días no alcanzan para millones de filas sin duplicar claves
+    first_date = pd.Timestamp('2000-01-03') + pd.Timedelta(minutes=start)
+    data = {
+        'Date': pd.date_range(first_date, periods=rows, freq='min').strftime('%Y-%m-%d %H:%M'),
+        'Label': rng.integers(0, 2, size=rows),
+    }
+    for i in range(1, 26):
+        lengths = rng.integers(min_words, max_words + 1, size=rows)
+        words = rng.choice(vocabulary, size=(rows, max_words), p=probabilities)
+        titles = np.array(
+            ['b"' + ' '.join(row[:n]) + '"' for row, n in zip(words, lengths)], dtype=object
+        )
+        titles[rng.random(rows) < missing_rate] = np.nan
+        data[f'Top{i}'] = titles
+    return pd.DataFrame(data)
+
+
+def write_headlines_csv(path, rows, chunk_rows=100000, seed=0, **options):
+    """Escribir un CSV sintético de cualquier tamaño generándolo por lotes (memoria acotada)"""
+    for i, offset in enumerate(range(0, rows, chunk_rows)):
+        chunk = make_headlines_frame(min(chunk_rows, rows - offset), seed=seed + i, start=offset, **options)
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+    return path
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Tamaño de los bloques con que se lee la parte ya procesada para calcular su hash
+DIGEST_BLOCK_BYTES = 1024 * 1024
+
+
+def raw_row_hashes(df):
+    """Huella de cada fila cruda del CSV (como texto, para no depender de los tipos inferidos)"""
+    return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy(dtype=np.uint64)
+
+
+class Checkpoint:
+    """Estado persistido de la última ejecución incremental sobre un archivo de entrada.
+
+    Guarda en JSON la huella del archivo (ruta, tamaño, mtime), el offset en
+    bytes hasta donde se procesó, el hash de todo el contenido ya procesado
+    para comprobar que el archivo solo creció por el final, el encabezado y la
+    codificación; y en un .npy al lado, la huella de cada fila procesada para
+    detectar filas nuevas o modificadas cuando el archivo se reescribió.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hashes_path = os.path.splitext(path)[0] + '_rows.npy'
+        self.state = {}
+        self.row_hashes = np.array([], dtype=np.uint64)
+
+    def load(self, input_path):
+        """Cargar el checkpoint si corresponde al mismo archivo de entrada; devuelve True si existe"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('input_path') != os.path.abspath(input_path):
+                return False
+            self.state = state
+            if os.path.exists(self.hashes_path):
+                self.row_hashes = np.load(self.hashes_path)
+            return True
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Checkpoint ilegible, se procesará el archivo completo: {e}")
+            return False
+
+    @staticmethod
+    def _prefix_digest(input_path, offset):
+        """Hash de los bytes [0, offset), leídos por bloques (un cambio en cualquier fila procesada lo altera)"""
+        digest = hashlib.sha256()
+        remaining = offset
+        with open(input_path, 'rb') as f:
+            while remaining > 0:
+                block = f.read(min(remaining, DIGEST_BLOCK_BYTES))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+        return digest.hexdigest()
+
+    def change_type(self, input_path):
+        """'unchanged', 'append' (solo se agregaron bytes al final) o 'rewritten'"""
+        if not self.state:
+            return 'rewritten'
+        stat = os.stat(input_path)
+        offset = self.state['offset']
+        if stat.st_size == self.state['size'] and stat.st_mtime_ns == self.state['mtime_ns']:
+            return 'unchanged'
+        # Checkpoints sin prefix_digest (versiones anteriores) se tratan como reescritura: el diff por filas decide
+        expected = self.state.get('prefix_digest')
+        if expected and stat.st_size >= offset and self._prefix_digest(input_path, offset) == expected:
+            return 'unchanged' if stat.st_size == offset else 'append'
+        return 'rewritten'
+
+    def new_row_mask(self, raw_df):
+        """True para las filas cuya huella no se procesó antes (nuevas o modificadas)"""
+        hashes = raw_row_hashes(raw_df)
+        return ~np.isin(hashes, self.row_hashes), hashes
+
+    def save(self, input_path, stat, columns, encoding, row_hashes, replace_hashes=False, max_date=None):
+        """Registrar el archivo como procesado hasta el tamaño que tenía al leerlo (stat)"""
+        self.state = {
+            'input_path': os.path.abspath(input_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'offset': stat.st_size,
+            'prefix_digest': self._prefix_digest(input_path, stat.st_size),
+            'columns': list(columns),
+            'encoding': encoding,
+            'max_date': max_date,
+        }
+        if replace_hashes:
+            self.row_hashes = np.unique(row_hashes)
+        else:
+            self.row_hashes = np.union1d(self.row_hashes, row_hashes)
+
+        checkpoint_dir = os.path.dirname(self.path)
+        if checkpoint_dir and not os.path.exists(checkpoint_dir):
+            os.makedirs(checkpoint_dir)
+        np.save(self.hashes_path, self.row_hashes)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
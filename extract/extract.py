@@ -1,9 +1,115 @@
+from config.settings import Settings
+from extract.checkpoint import raw_row_hashes
 import pandas as pd
+import codecs
+import io
+import json
 import os
+import time
 
 class Extract:
+    ENCODINGS_TO_TRY = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'utf-16']
+    VALIDATION_BLOCK_BYTES = 1024 * 1024
+
     def __init__(self, csv_path):
         self.csv_path = csv_path
+        self.rows_extracted = 0
+        self.config = Settings()
+        self.timings = {}
+        self.encoding = None
+
+    def _file_fingerprint(self):
+        """Huella del archivo para la caché de codificación: ruta, tamaño y mtime"""
+        stat = os.stat(self.csv_path)
+        return os.path.abspath(self.csv_path), stat.st_size, stat.st_mtime_ns
+
+    def _read_encoding_cache(self):
+        cache_path = self.config.ENCODING_CACHE_PATH
+        if not cache_path or not os.path.exists(cache_path):
+            return {}
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _cached_encoding(self):
+        """Devolver la codificación cacheada si el archivo no cambió desde la última lectura"""
+        path, size, mtime = self._file_fingerprint()
+        hint = self._read_encoding_cache().get(path)
+        if hint and hint.get('size') == size and hint.get('mtime_ns') == mtime:
+            return hint.get('encoding')
+        return None
+
+    def _store_encoding_hint(self, encoding):
+        cache_path = self.config.ENCODING_CACHE_PATH
+        if not cache_path:
+            return
+        try:
+            path, size, mtime = self._file_fingerprint()
+            cache = self._read_encoding_cache()
+            cache[path] = {'size': size, 'mtime_ns': mtime, 'encoding': encoding}
+            cache_dir = os.path.dirname(cache_path)
+            if cache_dir and not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la caché de codificación: {e}")
+
+    def _sniff_encoding(self):
+        """Detectar la codificación a partir de una muestra acotada de bytes del inicio del archivo.
+
+        Un byte inválido después de la muestra no se detecta aquí sino al
+        leerlo: en modo streaming la carga se aborta (ver extract_chunks). Con
+        ENCODING_SAMPLE_BYTES = None se valida el archivo completo por bloques.
+        """
+        sample_size = self.config.ENCODING_SAMPLE_BYTES
+        with open(self.csv_path, 'rb') as f:
+            sample = f.read(sample_size or self.VALIDATION_BLOCK_BYTES)
+            is_complete = not f.read(1)
+
+            # Marcas BOM explícitas
+            if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                return 'utf-16'
+            if sample.startswith(codecs.BOM_UTF8):
+                return 'utf-8'
+
+            for encoding in self.ENCODINGS_TO_TRY:
+                decoder = codecs.getincrementaldecoder(encoding)()
+                try:
+                    # Si la muestra está truncada, un carácter multibyte puede quedar cortado al final
+                    decoder.decode(sample, final=is_complete)
+                    if sample_size is None and not is_complete:
+                        # Resto del archivo por bloques, sin cargarlo completo en memoria
+                        f.seek(len(sample))
+                        for block in iter(lambda: f.read(self.VALIDATION_BLOCK_BYTES), b''):
+                            decoder.decode(block)
+                        decoder.decode(b'', final=True)
+                    return encoding
+                except UnicodeDecodeError:
+                    continue
+        return None
+
+    def _detect_encoding(self):
+        """Codificación candidata: pista cacheada o muestreo del archivo"""
+        start = time.perf_counter()
+        encoding = self._cached_encoding()
+        source = 'caché'
+        if encoding is None:
+            encoding = self._sniff_encoding()
+            source = 'muestra'
+        self.timings['encoding_detection'] = time.perf_counter() - start
+        if encoding is not None:
+            print(f"🔍 Codificación detectada ({source}): {encoding} "
+                  f"en {self.timings['encoding_detection'] * 1000:.1f} ms")
+        return encoding
+
+    def _candidate_encodings(self):
+        """Codificación detectada primero; el resto solo como respaldo si la lectura falla"""
+        detected = self._detect_encoding()
+        fallback = [enc for enc in self.ENCODINGS_TO_TRY if enc != detected]
+        return ([detected] if detected else []) + fallback
 
     def extract(self):
         try:
@@ -12,15 +118,18 @@ class Extract:
                 print(f"❌ Error: El archivo {self.csv_path} no existe")
                 return None
             
-            # Intentar diferentes codificaciones para leer el CSV
-            encodings_to_try = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'utf-16']
+            # Leer una sola vez con la codificación detectada (las demás son respaldo)
             df = None
             
-            for encoding in encodings_to_try:
+            for encoding in self._candidate_encodings():
                 try:
-                    print(f"🔍 Intentando codificación: {encoding}")
+                    start = time.perf_counter()
                     df = pd.read_csv(self.csv_path, encoding=encoding)
-                    print(f"✅ Archivo leído exitosamente con codificación: {encoding}")
+                    self.timings['parse'] = time.perf_counter() - start
+                    print(f"✅ Archivo leído exitosamente con codificación: {encoding} "
+                          f"en {self.timings['parse']:.2f} s")
+                    self._store_encoding_hint(encoding)
+                    self.encoding = encoding
                     break
                 except UnicodeDecodeError:
                     print(f"⚠️ Falló con codificación: {encoding}")
@@ -33,6 +142,7 @@ class Extract:
                 print("❌ No se pudo leer el archivo con ninguna codificación disponible")
                 return None
             
+            self.rows_extracted = len(df)
             print(f"✅ Datos extraídos exitosamente: {len(df)} registros encontrados")
             print(f"📊 Columnas disponibles: {list(df.columns)}")
             print(f"📅 Rango de fechas: {df['Date'].min()} a {df['Date'].max()}")
@@ -47,3 +157,109 @@ class Extract:
             print(f"❌ Error inesperado al leer el archivo CSV: {e}")
             return None
 
+    def extract_chunks(self, chunk_size):
+        """Leer el CSV en modo streaming, generando DataFrames de tamaño fijo.
+
+        Si la lectura falla después de entregar lotes, la excepción se propaga
+        para que la carga no tome el flujo cortado como completo.
+        """
+        self.rows_extracted = 0
+        if not os.path.exists(self.csv_path):
+            print(f"❌ Error: El archivo {self.csv_path} no existe")
+            return
+
+        for encoding in self._candidate_encodings():
+            try:
+                with pd.read_csv(self.csv_path, encoding=encoding, chunksize=chunk_size) as reader:
+                    # Solo se mide el tiempo de lectura, no el de los consumidores del generador
+                    parse_time = 0.0
+                    while True:
+                        start = time.perf_counter()
+                        chunk = next(reader, None)
+                        parse_time += time.perf_counter() - start
+                        if chunk is None:
+                            break
+                        self.rows_extracted += len(chunk)
+                        yield chunk
+            except UnicodeDecodeError:
+                # Solo se puede reintentar si todavía no se entregó ningún lote
+                if self.rows_extracted == 0:
+                    print(f"⚠️ Falló con codificación: {encoding}")
+                    continue
+                # Los lotes entregados no son el archivo completo: el consumidor debe abortar la carga
+                print(f"❌ Error de codificación a mitad del archivo con {encoding} "
+                      f"(tras {self.rows_extracted} registros)")
+                raise
+            except Exception as e:
+                print(f"❌ Error inesperado al leer el archivo CSV por lotes: {e}")
+                if self.rows_extracted:
+                    raise
+                return
+
+            self.timings['parse'] = parse_time
+            self._store_encoding_hint(encoding)
+            print(f"✅ Datos extraídos exitosamente: {self.rows_extracted} registros encontrados "
+                  f"con codificación {encoding} en {self.timings['parse']:.2f} s")
+            return
+
+        print("❌ No se pudo leer el archivo con ninguna codificación disponible")
+
+    def extract_delta(self, checkpoint):
+        """Leer solo las filas nuevas o modificadas respecto al checkpoint.
+
+        Devuelve (DataFrame, tipo de cambio). Si el archivo solo creció por el
+        final se leen únicamente los bytes agregados; si fue reescrito se lee
+        completo y se conservan las filas cuya huella no se procesó antes.
+        Deja en self.stat y self.row_hashes lo necesario para actualizar el
+        checkpoint cuando la carga termine.
+        """
+        if not os.path.exists(self.csv_path):
+            print(f"❌ Error: El archivo {self.csv_path} no existe")
+            return None, None
+
+        # Huella tomada antes de leer: lo que se agregue durante la lectura queda para la próxima
+        self.stat = os.stat(self.csv_path)
+        change = checkpoint.change_type(self.csv_path)
+        encoding = checkpoint.state.get('encoding')
+        if change == 'append' and (not encoding or encoding.startswith('utf-16')):
+            # Sin codificación conocida o con BOM no se puede decodificar desde la mitad del archivo
+            change = 'rewritten'
+
+        if change == 'unchanged':
+            self.rows_extracted = 0
+            self.row_hashes = checkpoint.row_hashes[:0]
+            print("✅ El archivo de entrada no cambió desde la última ejecución")
+            return pd.DataFrame(columns=checkpoint.state.get('columns', [])), change
+
+        if change == 'append':
+            start = time.perf_counter()
+            offset = checkpoint.state['offset']
+            with open(self.csv_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read(self.stat.st_size - offset)
+            columns = checkpoint.state['columns']
+            if data.strip():
+                df = pd.read_csv(io.BytesIO(data), header=None, names=columns, encoding=encoding)
+            else:
+                df = pd.DataFrame(columns=columns)
+            self.timings['parse'] = time.perf_counter() - start
+            self.encoding = encoding
+            self.row_hashes = raw_row_hashes(df)
+            print(f"✅ Filas agregadas al final del archivo: {len(df)} "
+                  f"({len(data) / 1024:.0f} KB leídos desde el byte {offset})")
+        else:
+            df = self.extract()
+            if df is None:
+                return None, None
+            is_new, self.row_hashes = checkpoint.new_row_mask(df)
+            # Las salidas se actualizan por fecha: se reenvían todas las filas de cada fecha afectada
+            if 'Date' in df.columns:
+                is_new |= df['Date'].isin(df.loc[is_new, 'Date']).to_numpy()
+            df = df[is_new]
+            if checkpoint.state:
+                print(f"✅ Archivo reescrito: {len(df)} filas nuevas o modificadas de {len(is_new)}")
+            else:
+                print("✅ Sin checkpoint previo: se procesa el archivo completo")
+
+        self.rows_extracted = len(df)
+        return df, change
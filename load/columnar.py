@@ -0,0 +1,83 @@
+import os
+
+
+class ColumnarWriter:
+    """Escritor incremental de Parquet o Feather (Arrow IPC) a partir de DataFrames.
+
+    Cada llamada a write() agrega un lote al mismo archivo, por lo que sirve
+    tanto para el DataFrame completo como para el modo streaming. El esquema
+    se fija con el primer lote; las columnas que llegan vacías en ese lote se
+    declaran como texto para que los lotes siguientes sean compatibles.
+    Requiere pyarrow.
+    """
+
+    EXTENSIONS = {'parquet': '.parquet', 'feather': '.feather'}
+
+    def __init__(self, path, fmt, compression=None, row_group_size=None):
+        if fmt not in self.EXTENSIONS:
+            raise ValueError(f"Formato columnar desconocido: {fmt} (use 'parquet' o 'feather')")
+        import pyarrow  # noqa: F401  (falla aquí si pyarrow no está instalado)
+        self.path = path
+        self.fmt = fmt
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.schema = None
+        self._writer = None
+
+    def _open(self, table):
+        import pyarrow as pa
+        fields = [pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                  for field in table.schema]
+        self.schema = pa.schema(fields, metadata=table.schema.metadata)
+        if self.fmt == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self.path, self.schema,
+                                            compression=self.compression or 'none')
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+            self._writer = pa.ipc.new_file(self.path, self.schema, options=options)
+
+    def write(self, df):
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        if self._writer is None:
+            self._open(table)
+            table = table.cast(self.schema)
+        if self.fmt == 'parquet':
+            self._writer.write_table(table, row_group_size=self.row_group_size)
+        else:
+            self._writer.write_table(table, max_chunksize=self.row_group_size)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_columnar(path, columns=None):
+    """Leer un archivo Parquet o Feather, opcionalmente solo algunas columnas.
+
+    Los archivos se abren mapeados en memoria; en Feather sin compresión las
+    columnas numéricas no se copian al leerlas. Las columnas pedidas que no
+    existan en el archivo se ignoran.
+    """
+    if os.path.splitext(path)[1] == ColumnarWriter.EXTENSIONS['feather']:
+        import pyarrow.feather as feather
+        import pyarrow.ipc as ipc
+        if columns is not None:
+            names = ipc.open_file(path).schema.names
+            columns = [col for col in columns if col in names]
+        table = feather.read_table(path, columns=columns, memory_map=True)
+    else:
+        import pyarrow.parquet as pq
+        if columns is not None:
+            names = pq.read_schema(path).names
+            columns = [col for col in columns if col in names]
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas()
@@ -0,0 +1,59 @@
+from sqlalchemy import create_engine, event
+
+
+class DatabaseManager:
+    """Engine y pool de conexiones compartidos por todo el pipeline.
+
+    Se crea un único engine por URL de conexión; Load y las consultas de
+    estadísticas lo reutilizan en lugar de abrir uno nuevo en cada llamada.
+    En SQLite los pragmas de SQLITE_CONNECT_PRAGMAS se aplican a cada conexión
+    nueva del pool.
+    """
+
+    _engines = {}
+
+    @classmethod
+    def get_engine(cls, config):
+        url = config.DATABASE_URL
+        engine = cls._engines.get(url)
+        if engine is None:
+            engine = cls._create_engine(config, url)
+            cls._engines[url] = engine
+        return engine
+
+    @classmethod
+    def _create_engine(cls, config, url):
+        options = {'pool_pre_ping': config.DB_POOL_PRE_PING}
+        # SQLite en memoria usa un pool de una conexión por hilo que no admite estos parámetros
+        if ':memory:' not in url:
+            options.update(
+                pool_size=config.DB_POOL_SIZE,
+                max_overflow=config.DB_MAX_OVERFLOW,
+                pool_recycle=config.DB_POOL_RECYCLE,
+            )
+        try:
+            engine = create_engine(url, **options)
+        except ImportError as e:
+            raise ImportError(
+                f"Falta el driver para {url.split(':', 1)[0]}: {e}. "
+                "Para PostgreSQL instala psycopg2-binary."
+            ) from e
+
+        if engine.dialect.name == 'sqlite':
+            pragmas = dict(config.SQLITE_CONNECT_PRAGMAS)
+
+            @event.listens_for(engine, 'connect')
+            def apply_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+                cursor.close()
+
+        return engine
+
+    @classmethod
+    def dispose_all(cls):
+        """Cerrar todas las conexiones de los pools (por ejemplo al terminar el proceso ETL)"""
+        for engine in cls._engines.values():
+            engine.dispose()
+        cls._engines.clear()
@@ -1,66 +1,201 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.exc import OperationalError
+from load.database import DatabaseManager
+from load.columnar import ColumnarWriter, read_columnar
 from config.settings import Settings
+from transform.features import join_titles
+from transform.term_matrix import TermMatrixBuilder
+from transform.transform import SeenKeys
+from contextlib import contextmanager
+from itertools import islice
+import numpy as np
+import pandas as pd
+import sqlite3
 import os
 
 class Load:
-    def __init__(self, df):
+    # Mapear nombres de columnas del DataFrame a los nombres de la tabla
+    COLUMN_MAPPING = {
+        'Date': 'date',
+        'Year': 'year',
+        'Month': 'month',
+        'Day': 'day',
+        'DayOfWeek': 'day_of_week',
+        'Label': 'label',
+        'Sentiment': 'sentiment',
+        'ValidTitles': 'valid_titles',
+        'AvgTitleLength': 'avg_title_length',
+        'FinancialKeywords': 'financial_keywords',
+        'PositiveKeywords': 'positive_keywords',
+        'NegativeKeywords': 'negative_keywords',
+        'Top1': 'top1',
+        'Top2': 'top2',
+        'Top3': 'top3',
+        'Top4': 'top4',
+        'Top5': 'top5',
+        'Top6': 'top6',
+        'Top7': 'top7',
+        'Top8': 'top8',
+        'Top9': 'top9',
+        'Top10': 'top10',
+        'Top11': 'top11',
+        'Top12': 'top12',
+        'Top13': 'top13',
+        'Top14': 'top14',
+        'Top15': 'top15',
+        'Top16': 'top16',
+        'Top17': 'top17',
+        'Top18': 'top18',
+        'Top19': 'top19',
+        'Top20': 'top20',
+        'Top21': 'top21',
+        'Top22': 'top22',
+        'Top23': 'top23',
+        'Top24': 'top24',
+        'Top25': 'top25',
+        'AllTitles': 'all_titles'
+    }
+
+    # Formato de fecha con el que to_sql escribe en SQLite; todas las cargas lo usan
+    DATE_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+    # Fechas por consulta al buscar las filas guardadas de los días que llegan (WHERE date IN ...)
+    DATE_LOOKUP_BATCH_SIZE = 500
+
+    # Definir el esquema de la tabla para datos de sentimiento
+    CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS sentiment_analysis (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date DATE NOT NULL,
+        year INTEGER,
+        month INTEGER,
+        day INTEGER,
+        day_of_week TEXT,
+        label INTEGER NOT NULL,
+        sentiment TEXT,
+        valid_titles INTEGER,
+        avg_title_length REAL,
+        financial_keywords INTEGER,
+        positive_keywords INTEGER,
+        negative_keywords INTEGER,
+        top1 TEXT,
+        top2 TEXT,
+        top3 TEXT,
+        top4 TEXT,
+        top5 TEXT,
+        top6 TEXT,
+        top7 TEXT,
+        top8 TEXT,
+        top9 TEXT,
+        top10 TEXT,
+        top11 TEXT,
+        top12 TEXT,
+        top13 TEXT,
+        top14 TEXT,
+        top15 TEXT,
+        top16 TEXT,
+        top17 TEXT,
+        top18 TEXT,
+        top19 TEXT,
+        top20 TEXT,
+        top21 TEXT,
+        top22 TEXT,
+        top23 TEXT,
+        top24 TEXT,
+        top25 TEXT,
+        all_titles TEXT,
+        row_hash TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """
+
+    # Índices secundarios para filtros y agrupaciones frecuentes
+    INDEXES = {
+        'ix_sentiment_analysis_date': 'date',
+        'ix_sentiment_analysis_year': 'year',
+        'ix_sentiment_analysis_label': 'label',
+    }
+
+    # Tablas de agregados por periodo y sentimiento: nombre -> columnas del periodo
+    ROLLUP_TABLES = {
+        'sentiment_daily': ['date'],
+        'sentiment_monthly': ['year', 'month'],
+        'sentiment_yearly': ['year'],
+    }
+    ROLLUP_METRICS = ['valid_titles', 'financial_keywords', 'positive_keywords', 'negative_keywords']
+
+    # Almacenamiento normalizado de titulares: cada texto distinto una sola vez, con su huella
+    # de 64 bits como clave, y un enlace (día, posición Top1-Top25) -> titular
+    NEWS_COLUMNS = [f'top{i}' for i in range(1, 26)]
+    HEADLINES_SQL = """
+    CREATE TABLE IF NOT EXISTS headlines (
+        headline_id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL
+    )
+    """
+    HEADLINE_LINKS_SQL = """
+    CREATE TABLE IF NOT EXISTS sentiment_headline_links (
+        analysis_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        headline_id INTEGER NOT NULL,
+        PRIMARY KEY (analysis_id, position)
+    ) WITHOUT ROWID
+    """
+
+    # Índice de texto completo (FTS5) de titulares con contenido externo: el texto no se duplica,
+    # el índice guarda solo los términos y el rowid de cada fila de la tabla de origen
+    HEADLINE_INDEX = 'sentiment_headlines'
+    # Tabla, columna y rowid indexados: all_titles de cada día o, normalizado, cada titular distinto
+    HEADLINE_SOURCES = {
+        'wide': ('sentiment_analysis', 'all_titles', 'rowid'),
+        'normalized': ('headlines', 'title', 'headline_id'),
+    }
+
+    def __init__(self, df=None, config=None):
         self.df = df
-        self.config = Settings()
+        self.rows_loaded = 0
+        # Filas que la carga incremental no guarda por repetir una fecha ya cargada (con otra etiqueta)
+        self.rows_skipped = 0
+        self.config = config or Settings()
+
+    @property
+    def engine(self):
+        """Engine compartido (un pool de conexiones por URL) para todas las operaciones"""
+        return DatabaseManager.get_engine(self.config)
+
+    @property
+    def is_sqlite(self):
+        return self.engine.dialect.name == 'sqlite'
+
+    @property
+    def normalized(self):
+        return self.config.HEADLINE_STORAGE == 'normalized'
+
+    def _create_table_sql(self, table_name='sentiment_analysis'):
+        """DDL del esquema declarado adaptada al dialecto de la base de datos"""
+        sql = self.CREATE_TABLE_SQL.replace('sentiment_analysis', table_name, 1)
+        if self.normalized:
+            # Los titulares van en headlines y sentiment_headline_links; all_titles se deriva de ellos
+            text_columns = set(self.NEWS_COLUMNS + ['all_titles'])
+            sql = '\n'.join(line for line in sql.splitlines() if line.strip().split(' ')[0] not in text_columns)
+        if not self.is_sqlite:
+            sql = sql.replace('INTEGER PRIMARY KEY AUTOINCREMENT', 'BIGSERIAL PRIMARY KEY')
+        return sql
+
+    def _headline_tables_sql(self):
+        """DDL de las tablas del almacenamiento normalizado adaptada al dialecto"""
+        statements = [self.HEADLINES_SQL, self.HEADLINE_LINKS_SQL]
+        if not self.is_sqlite:
+            statements = [sql.replace('INTEGER', 'BIGINT').replace(' WITHOUT ROWID', '') for sql in statements]
+        return statements
 
     def create_table(self):
         """Crear la tabla en la base de datos SQLite si no existe"""
         try:
-            # Crear conexión usando SQLAlchemy
-            engine = create_engine(self.config.DATABASE_URL)
-            
-            # Definir el esquema de la tabla para datos de sentimiento
-            create_table_sql = """
-            CREATE TABLE IF NOT EXISTS sentiment_analysis (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE NOT NULL,
-                year INTEGER,
-                month INTEGER,
-                day INTEGER,
-                day_of_week TEXT,
-                label INTEGER NOT NULL,
-                sentiment TEXT,
-                valid_titles INTEGER,
-                avg_title_length REAL,
-                financial_keywords INTEGER,
-                positive_keywords INTEGER,
-                negative_keywords INTEGER,
-                top1 TEXT,
-                top2 TEXT,
-                top3 TEXT,
-                top4 TEXT,
-                top5 TEXT,
-                top6 TEXT,
-                top7 TEXT,
-                top8 TEXT,
-                top9 TEXT,
-                top10 TEXT,
-                top11 TEXT,
-                top12 TEXT,
-                top13 TEXT,
-                top14 TEXT,
-                top15 TEXT,
-                top16 TEXT,
-                top17 TEXT,
-                top18 TEXT,
-                top19 TEXT,
-                top20 TEXT,
-                top21 TEXT,
-                top22 TEXT,
-                top23 TEXT,
-                top24 TEXT,
-                top25 TEXT,
-                all_titles TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            """
+            # Conexión tomada del pool compartido
+            engine = self.engine
             
             with engine.connect() as conn:
-                conn.execute(text(create_table_sql))
+                conn.execute(text(self._create_table_sql()))
                 conn.commit()
             
             print("✅ Tabla 'sentiment_analysis' creada exitosamente")
@@ -70,67 +205,162 @@ class Load:
             print(f"❌ Error al crear la tabla: {e}")
             return False
 
+    def _create_indexes(self, conn):
+        inspector = inspect(conn)
+        columns = {col['name'] for col in inspector.get_columns('sentiment_analysis')}
+        indexes = {index['name'] for index in inspector.get_indexes('sentiment_analysis')}
+        for name, column in self.INDEXES.items():
+            if name == 'ix_sentiment_analysis_date' and 'ux_sentiment_analysis_date' in indexes:
+                # En modo incremental el índice único de date ya cubre las consultas por fecha
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                continue
+            if column in columns:
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON sentiment_analysis ({column})"))
+        if self.normalized and self.config.HEADLINE_SEARCH:
+            # Días en los que aparece cada titular, para la búsqueda (la clave primaria cubre la consulta por día)
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_sentiment_headline_links_headline
+                ON sentiment_headline_links (headline_id)
+            """))
+
+    def _refresh_rollups(self, conn, touched=None):
+        """Recalcular las tablas de agregados (conteos y promedios de palabras clave por sentimiento).
+
+        Con touched (DataFrame con date/year/month de los días insertados o
+        actualizados) solo se recalculan los periodos de esos días: se borran
+        sus grupos (de todos los sentimientos, por si cambió la etiqueta) y se
+        vuelven a insertar desde sentiment_analysis. Sin touched, o si la tabla
+        de agregados no existe o cambió de columnas, se reconstruye completa.
+        """
+        inspector = inspect(conn)
+        columns = {col['name'] for col in inspector.get_columns('sentiment_analysis')}
+        metrics = [col for col in self.ROLLUP_METRICS if col in columns]
+        averages = ''.join(f", AVG({col}) AS avg_{col}" for col in metrics)
+        for table, period in self.ROLLUP_TABLES.items():
+            keys = ', '.join(period + ['sentiment'])
+            if not columns.issuperset(period + ['sentiment']):
+                # Transform con TRANSFORM_COLUMNS puede no producir las columnas del periodo
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+                continue
+            expected = {*period, 'sentiment', 'records', *(f"avg_{col}" for col in metrics)}
+            incremental = (touched is not None and set(period).issubset(touched.columns)
+                           and inspector.has_table(table)
+                           and {col['name'] for col in inspector.get_columns(table)} == expected)
+            if incremental:
+                periods = touched[period].drop_duplicates().to_dict('records')
+                if not periods:
+                    continue
+                where = ' AND '.join(f"{col} = :{col}" for col in period)
+                conn.execute(text(f"DELETE FROM {table} WHERE {where}"), periods)
+                conn.execute(text(f"""
+                    INSERT INTO {table} ({keys}, records{''.join(f", avg_{col}" for col in metrics)})
+                    SELECT {keys}, COUNT(*) AS records{averages}
+                    FROM sentiment_analysis
+                    WHERE {where}
+                    GROUP BY {keys}
+                """), periods)
+                continue
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+            conn.execute(text(f"""
+                CREATE TABLE {table} AS
+                SELECT {keys}, COUNT(*) AS records{averages}
+                FROM sentiment_analysis
+                GROUP BY {keys}
+            """))
+            conn.execute(text(f"CREATE UNIQUE INDEX ux_{table} ON {table} ({keys})"))
+
+    def _headline_triggers(self):
+        """Triggers que mantienen el índice de titulares en las cargas incrementales.
+
+        Una carga 'replace' descarta la tabla de origen y con ella sus triggers,
+        lo que indica que el índice debe reconstruirse.
+        """
+        table, column, _ = self.HEADLINE_SOURCES[self.config.HEADLINE_STORAGE]
+        index = self.HEADLINE_INDEX
+        insert = f"INSERT INTO {index} (rowid, {column}) VALUES (new.rowid, new.{column});"
+        delete = f"INSERT INTO {index} ({index}, rowid, {column}) VALUES ('delete', old.rowid, old.{column});"
+        prefix = f"{index}_{table}"
+        return {
+            f"{prefix}_ai": f"AFTER INSERT ON {table} BEGIN {insert} END",
+            f"{prefix}_ad": f"AFTER DELETE ON {table} BEGIN {delete} END",
+            f"{prefix}_au": f"AFTER UPDATE OF {column} ON {table} BEGIN {delete} {insert} END",
+        }
+
+    def _refresh_headline_index(self, conn):
+        """Crear o reconstruir el índice FTS5 de titulares si la tabla de origen se reemplazó desde la última carga.
+
+        Si los triggers siguen existiendo, la tabla no se reemplazó y el índice
+        ya se actualizó fila a fila durante la carga incremental.
+        """
+        if not self.is_sqlite:
+            return
+        index = self.HEADLINE_INDEX
+        table, column, rowid = self.HEADLINE_SOURCES[self.config.HEADLINE_STORAGE]
+        triggers = self._headline_triggers()
+        existing = {row[0] for row in conn.execute(text(
+            f"SELECT name FROM sqlite_master WHERE name = '{index}' OR (type = 'trigger' AND name LIKE '{index}_%')"
+        ))}
+        inspector = inspect(conn)
+        # Sin all_titles (Transform con TRANSFORM_COLUMNS) no hay texto que indexar
+        has_source = inspector.has_table(table) and column in {col['name'] for col in inspector.get_columns(table)}
+        enabled = self.config.HEADLINE_SEARCH and has_source
+        if enabled and existing == {index, *triggers}:
+            return
+        
+        # Se descartan el índice y los triggers anteriores (desactualizados o de otro modo de almacenamiento)
+        for name in existing - {index}:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        if index in existing:
+            conn.execute(text(f"DROP TABLE {index}"))
+        if not enabled:
+            return
+        try:
+            # remove_diacritics: "cafe" también encuentra "Café"
+            conn.execute(text(f"""
+                CREATE VIRTUAL TABLE {index} USING fts5(
+                    {column}, content='{table}', content_rowid='{rowid}',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """))
+        except OperationalError as e:
+            print(f"⚠️ SQLite sin FTS5; no se crea el índice de titulares: {e}")
+            return
+        for name, body in triggers.items():
+            conn.execute(text(f"CREATE TRIGGER {name} {body}"))
+        conn.execute(text(f"INSERT INTO {index} ({index}) VALUES ('rebuild')"))
+        print(f"✅ Índice de búsqueda de titulares '{index}' reconstruido")
+
+    def _refresh_indexes_and_rollups(self, engine, touched=None):
+        """Mantener índices, agregados e índice de titulares al terminar cada carga (to_sql 'replace' descarta los índices).
+
+        touched: periodos de los días que cambió una carga incremental (ver _refresh_rollups)
+        """
+        with engine.begin() as conn:
+            if not self.normalized:
+                # Tablas normalizadas de una carga anterior: ya no corresponden a sentiment_analysis
+                conn.execute(text("DROP TABLE IF EXISTS sentiment_headline_links"))
+                conn.execute(text("DROP TABLE IF EXISTS headlines"))
+            self._create_indexes(conn)
+            self._refresh_rollups(conn, touched)
+            self._refresh_headline_index(conn)
+
     def load_to_database(self):
         """Cargar datos transformados a la base de datos SQLite"""
+        if self.config.LOAD_MODE == 'incremental':
+            return self.load_incremental()
+        if self.config.BULK_LOAD or self.normalized:
+            # El almacenamiento normalizado necesita los id de cada día para enlazar sus titulares
+            return self.bulk_load()
         try:
             # Crear la tabla primero
             if not self.create_table():
                 return False
             
             # Preparar los datos para la inserción
-            df_to_load = self.df.copy()
-            
-            # Mapear nombres de columnas del DataFrame a los nombres de la tabla
-            column_mapping = {
-                'Date': 'date',
-                'Year': 'year',
-                'Month': 'month',
-                'Day': 'day',
-                'DayOfWeek': 'day_of_week',
-                'Label': 'label',
-                'Sentiment': 'sentiment',
-                'ValidTitles': 'valid_titles',
-                'AvgTitleLength': 'avg_title_length',
-                'FinancialKeywords': 'financial_keywords',
-                'PositiveKeywords': 'positive_keywords',
-                'NegativeKeywords': 'negative_keywords',
-                'Top1': 'top1',
-                'Top2': 'top2',
-                'Top3': 'top3',
-                'Top4': 'top4',
-                'Top5': 'top5',
-                'Top6': 'top6',
-                'Top7': 'top7',
-                'Top8': 'top8',
-                'Top9': 'top9',
-                'Top10': 'top10',
-                'Top11': 'top11',
-                'Top12': 'top12',
-                'Top13': 'top13',
-                'Top14': 'top14',
-                'Top15': 'top15',
-                'Top16': 'top16',
-                'Top17': 'top17',
-                'Top18': 'top18',
-                'Top19': 'top19',
-                'Top20': 'top20',
-                'Top21': 'top21',
-                'Top22': 'top22',
-                'Top23': 'top23',
-                'Top24': 'top24',
-                'Top25': 'top25',
-                'AllTitles': 'all_titles'
-            }
-            
-            # Renombrar columnas
-            df_to_load = df_to_load.rename(columns=column_mapping)
-            
-            # Seleccionar solo las columnas que existen en el DataFrame
-            available_columns = [col for col in column_mapping.values() if col in df_to_load.columns]
-            df_to_load = df_to_load[available_columns]
-            
-            # Crear conexión usando SQLAlchemy
-            engine = create_engine(self.config.DATABASE_URL)
+            df_to_load = self._prepare_for_database(self.df)
+            
+            # Conexión tomada del pool compartido
+            engine = self.engine
             
             # Cargar datos a la base de datos
             df_to_load.to_sql(
@@ -138,9 +368,12 @@ class Load:
                 engine,
                 if_exists='replace',  # Reemplazar datos existentes
                 index=False,
-                method='multi'  # Inserción más eficiente
+                method='multi',  # Inserción más eficiente
+                chunksize=self._multi_insert_chunksize(df_to_load)
             )
+            self._refresh_indexes_and_rollups(engine)
             
+            self.rows_loaded = len(df_to_load)
             print(f"✅ Datos cargados exitosamente a SQLite: {len(df_to_load)} registros insertados")
             return True
             
@@ -148,6 +381,433 @@ class Load:
             print(f"❌ Error al cargar datos a la base de datos: {e}")
             return False
 
+    def _multi_insert_chunksize(self, df):
+        """Filas por INSERT multi-fila sin superar el límite de variables de SQLite"""
+        max_variables = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+        return max(1, max_variables // max(1, len(df.columns)))
+
+    def _prepare_for_database(self, df):
+        """Renombrar columnas al esquema de la tabla y descartar las que no existen"""
+        # Una sola copia: se seleccionan las columnas y se renombran sobre esa copia
+        columns = [col for col in self.COLUMN_MAPPING if col in df.columns]
+        if self.normalized:
+            # all_titles no se guarda: se deriva de los titulares enlazados
+            columns = [col for col in columns if col != 'AllTitles']
+        df_to_load = df.reindex(columns=columns)
+        if 'AllTitles' not in df.columns and 'Top1' in df.columns and not self.normalized:
+            # Transform con LAZY_ALL_TITLES: el texto combinado se genera solo para la base de datos
+            df_to_load['AllTitles'] = join_titles(df)
+        df_to_load.columns = [self.COLUMN_MAPPING[col] for col in df_to_load.columns]
+        return df_to_load
+
+    def _database_records(self, df_to_load):
+        """Convertir el DataFrame preparado a valores que SQLite acepta (fechas como texto, nulos como None)"""
+        records = df_to_load.astype(object)
+        if 'date' in records.columns:
+            # Mismo formato que escribe to_sql, para que ambos modos de carga sean consistentes
+            records['date'] = pd.to_datetime(df_to_load['date']).dt.strftime(self.DATE_FORMAT)
+        records = records.where(records.notna(), None)
+        # Huella de cada fila para detectar días modificados sin comparar columna a columna
+        hashes = pd.util.hash_pandas_object(records, index=False)
+        records['row_hash'] = hashes.map('{:016x}'.format)
+        return records
+
+    def _ensure_incremental_schema(self, engine):
+        """Asegurar el esquema declarado, el índice único por fecha y la tabla de estado de cargas"""
+        with engine.begin() as conn:
+            inspector = inspect(conn)
+            columns, needs_migration = [], False
+            if inspector.has_table('sentiment_analysis'):
+                columns = [col['name'] for col in inspector.get_columns('sentiment_analysis')]
+                has_date_key = any(index['name'] == 'ux_sentiment_analysis_date'
+                                   for index in inspector.get_indexes('sentiment_analysis'))
+                needs_migration = 'id' not in columns or (not has_date_key and conn.execute(
+                    text("SELECT 1 FROM sentiment_analysis LIMIT 1")).first() is not None)
+            if needs_migration:
+                # Tabla creada por una carga 'replace' (to_sql o masiva): puede tener fechas repetidas.
+                # Se copian sus filas al esquema declarado en una tabla aparte que al final reemplaza a la original.
+                print("🔧 Migrando la tabla 'sentiment_analysis' al esquema declarado...")
+                conn.execute(text("DROP TABLE IF EXISTS sentiment_analysis_migrated"))
+                conn.execute(text(self._create_table_sql('sentiment_analysis_migrated')))
+                conn.execute(text("""
+                    CREATE UNIQUE INDEX ux_sentiment_analysis_date
+                    ON sentiment_analysis_migrated (date)
+                """))
+                declared = list(self.COLUMN_MAPPING.values()) + ['row_hash']
+                common = ', '.join(col for col in columns if col in declared)
+                # En SQLite se conserva la primera fila de cada fecha según el orden de inserción
+                order = 'ORDER BY rowid' if self.is_sqlite else ''
+                conn.execute(text(f"""
+                    INSERT INTO sentiment_analysis_migrated ({common})
+                    SELECT {common} FROM sentiment_analysis WHERE true {order}
+                    ON CONFLICT DO NOTHING
+                """))
+                dropped = (conn.execute(text("SELECT COUNT(*) FROM sentiment_analysis")).scalar()
+                           - conn.execute(text("SELECT COUNT(*) FROM sentiment_analysis_migrated")).scalar())
+                if dropped:
+                    print(f"⚠️ {dropped} registros con una fecha repetida (otra etiqueta) no se migran: "
+                          f"la fecha es la clave de la carga incremental")
+                conn.execute(text("DROP TABLE sentiment_analysis"))
+                conn.execute(text("ALTER TABLE sentiment_analysis_migrated RENAME TO sentiment_analysis"))
+            elif 'row_hash' not in columns:
+                conn.execute(text("ALTER TABLE sentiment_analysis ADD COLUMN row_hash TEXT"))
+            
+            conn.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS ux_sentiment_analysis_date
+                ON sentiment_analysis (date)
+            """))
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS etl_load_state (
+                    table_name TEXT PRIMARY KEY,
+                    high_water_mark TEXT,
+                    rows_inserted INTEGER,
+                    rows_updated INTEGER,
+                    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+
+    def _upsert_changed_rows(self, conn, df, loaded_dates=None):
+        """Insertar los días nuevos y actualizar los modificados, en la transacción abierta de conn.
+
+        Devuelve (insertados, actualizados, periodos): periodos son las columnas
+        date/year/month de los días que cambiaron, para recalcular sus agregados.
+        loaded_dates (SeenKeys) son las fechas de los lotes anteriores de la
+        misma carga por lotes.
+        """
+        records = self._database_records(self._prepare_for_database(df))
+        # La fecha es la clave: si un día llega con dos etiquetas (Transform deduplica por Date y
+        # Label) se conserva la primera y se cuentan las descartadas
+        duplicated = records['date'].duplicated(keep='first').to_numpy()
+        if loaded_dates is not None:
+            first = ~duplicated
+            duplicated[first] = ~loaded_dates.add_new(records.loc[first, 'date'], np.zeros(first.sum(), dtype=np.int64))
+        # load_incremental y load_stream informan el total al terminar
+        self.rows_skipped += int(duplicated.sum())
+        records = records[~duplicated]
+        period_columns = [col for col in ('date', 'year', 'month') if col in records.columns]
+        if records.empty:
+            return 0, 0, records[period_columns]
+        
+        high_water_mark = conn.execute(text(
+            "SELECT high_water_mark FROM etl_load_state WHERE table_name = 'sentiment_analysis'"
+        )).scalar()
+        
+        # Todo lo posterior a la marca de agua es nuevo; lo anterior se compara por huella
+        if high_water_mark:
+            is_new = records['date'] > high_water_mark
+        else:
+            is_new = pd.Series(False, index=records.index)
+        # Solo se consultan las fechas que llegan (índice único de date), no todo el historial
+        stored_hashes = self._stored_by_date(conn, records.loc[~is_new, 'date'], 'row_hash')
+        stored = records['date'].map(stored_hashes)
+        inserted = is_new | ~records['date'].isin(stored_hashes.keys())
+        updated = ~inserted & (stored != records['row_hash'])
+        changed = records[inserted | updated]
+        touched = changed[period_columns]
+        
+        if not changed.empty:
+            news = None
+            if self.normalized:
+                changed, news = self._split_headlines(changed)
+            columns = list(changed.columns)
+            assignments = ', '.join(f"{col} = excluded.{col}" for col in columns if col != 'date')
+            conn.execute(text(f"""
+                INSERT INTO sentiment_analysis ({', '.join(columns)})
+                VALUES ({', '.join(':' + col for col in columns)})
+                ON CONFLICT(date) DO UPDATE SET {assignments}
+            """), changed.to_dict('records'))
+            if news is not None:
+                self._relink_headlines(conn, changed['date'], news, updated[inserted | updated])
+        
+        new_mark = max(filter(None, [high_water_mark, records['date'].max()]))
+        conn.execute(text("""
+            INSERT INTO etl_load_state (table_name, high_water_mark, rows_inserted, rows_updated, loaded_at)
+            VALUES ('sentiment_analysis', :hwm, :inserted, :updated, CURRENT_TIMESTAMP)
+            ON CONFLICT(table_name) DO UPDATE SET
+                high_water_mark = excluded.high_water_mark,
+                rows_inserted = excluded.rows_inserted,
+                rows_updated = excluded.rows_updated,
+                loaded_at = excluded.loaded_at
+        """), {'hwm': new_mark, 'inserted': int(inserted.sum()), 'updated': int(updated.sum())})
+        
+        return int(inserted.sum()), int(updated.sum()), touched
+
+    def _stored_by_date(self, conn, dates, column):
+        """{fecha: valor de column} de las filas guardadas con esas fechas, consultadas por lotes con IN"""
+        query = text(f"SELECT date, {column} FROM sentiment_analysis WHERE date IN :dates").bindparams(
+            bindparam('dates', expanding=True))
+        dates = list(dates)
+        rows = []
+        for start in range(0, len(dates), self.DATE_LOOKUP_BATCH_SIZE):
+            rows.extend(conn.execute(query, {'dates': dates[start:start + self.DATE_LOOKUP_BATCH_SIZE]}).fetchall())
+        stored = pd.DataFrame(rows, columns=['date', column])
+        # Otros motores devuelven la fecha como date: normalizar al formato de los registros
+        stored_dates = pd.to_datetime(stored['date']).dt.strftime(self.DATE_FORMAT)
+        return dict(zip(stored_dates, stored[column]))
+
+    def _relink_headlines(self, conn, dates, news, updated):
+        """Enlazar los titulares de los días insertados o actualizados por el upsert (misma transacción)"""
+        for sql in self._headline_tables_sql():
+            conn.execute(text(sql))
+        ids = dates.map(self._stored_by_date(conn, dates, 'id')).to_numpy()
+        if updated.any():
+            conn.execute(text("DELETE FROM sentiment_headline_links WHERE analysis_id = :id"),
+                         [{'id': int(day_id)} for day_id in ids[updated.to_numpy()]])
+        # Cursor DBAPI de la conexión de la transacción, para insertar con executemany
+        placeholder = '?' if conn.dialect.paramstyle == 'qmark' else '%s'
+        new_titles, links = self._insert_headlines(conn.connection.cursor(), placeholder, ids, news)
+        print(f"   🧩 Titulares normalizados: {links} enlaces, {new_titles} titulares nuevos")
+
+    def _apply_pragmas(self, cursor):
+        """Modo de journal y nivel de sincronización configurables para cargas masivas"""
+        cursor.execute(f"PRAGMA journal_mode={self.config.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={self.config.SQLITE_SYNCHRONOUS}")
+
+    def _split_headlines(self, records):
+        """Separar los titulares (top1-top25) de los registros para el almacenamiento normalizado"""
+        news_columns = [col for col in self.NEWS_COLUMNS if col in records.columns]
+        return records.drop(columns=news_columns), records[news_columns]
+
+    def _insert_headlines(self, cursor, placeholder, ids, news):
+        """Insertar los titulares distintos (por huella del contenido) y los enlaces día-posición-titular.
+
+        ids son los id de sentiment_analysis alineados con las filas de news.
+        Devuelve (titulares nuevos en la tabla, enlaces insertados).
+        """
+        values = news.to_numpy(dtype=object)
+        rows, cols = np.nonzero(pd.notna(values))
+        # Deduplicar por tabla hash antes de calcular las huellas: una por texto distinto
+        codes, titles = pd.factorize(values[rows, cols])
+        # Huella de 64 bits como entero con signo (INTEGER de SQLite / BIGINT)
+        hashes = pd.util.hash_array(np.asarray(titles, dtype=object)).view(np.int64)
+        # En orden de clave: las páginas de la tabla se llenan de forma secuencial y no por inserciones dispersas
+        order = np.argsort(hashes)
+        cursor.executemany(
+            f"INSERT INTO headlines (headline_id, title) VALUES ({placeholder}, {placeholder}) "
+            f"ON CONFLICT (headline_id) DO NOTHING",
+            zip(hashes[order].tolist(), np.asarray(titles, dtype=object)[order].tolist()))
+        inserted = cursor.rowcount
+        positions = np.array([int(col[len('top'):]) for col in news.columns])
+        cursor.executemany(
+            f"INSERT INTO sentiment_headline_links (analysis_id, position, headline_id) "
+            f"VALUES ({placeholder}, {placeholder}, {placeholder})",
+            zip(np.asarray(ids)[rows].tolist(), positions[cols].tolist(), hashes[codes].tolist()))
+        return inserted, len(codes)
+
+    def _bulk_insert(self, engine, df, replace):
+        """Insertar con executemany por lotes en una sola transacción; devuelve filas insertadas"""
+        # Conexión DBAPI tomada del pool del engine
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            if self.is_sqlite:
+                self._apply_pragmas(cursor)
+                cursor.execute("BEGIN")
+            inserted = self._bulk_insert_rows(cursor, engine.dialect, df, replace)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+        return inserted
+
+    def _bulk_insert_rows(self, cursor, dialect, df, replace):
+        """Insertar los registros de df con el cursor de una transacción abierta; devuelve filas insertadas"""
+        records = self._database_records(self._prepare_for_database(df))
+        news = None
+        if self.normalized:
+            records, news = self._split_headlines(records)
+        # Marcador de parámetros del driver DBAPI: '?' en sqlite3, '%s' en psycopg2
+        placeholder = '?' if dialect.paramstyle == 'qmark' else '%s'
+        batch_size = self.config.BULK_BATCH_SIZE
+        
+        if replace:
+            # Reemplazar conservando el esquema declarado (id, row_hash, created_at)
+            cursor.execute("DROP TABLE IF EXISTS sentiment_analysis")
+            cursor.execute(self._create_table_sql())
+            if news is not None:
+                cursor.execute("DROP TABLE IF EXISTS sentiment_headline_links")
+                cursor.execute("DROP TABLE IF EXISTS headlines")
+        if news is not None:
+            for sql in self._headline_tables_sql():
+                cursor.execute(sql)
+            # id explícitos (a continuación de los existentes) para enlazar los titulares de cada día
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM sentiment_analysis")
+            first_id = cursor.fetchone()[0] + 1
+            records.insert(0, 'id', range(first_id, first_id + len(records)))
+        
+        columns = list(records.columns)
+        insert_sql = (f"INSERT INTO sentiment_analysis ({', '.join(columns)}) "
+                      f"VALUES ({', '.join(placeholder for _ in columns)})")
+        rows = records.itertuples(index=False, name=None)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            cursor.executemany(insert_sql, batch)
+        if news is not None and not self.is_sqlite:
+            # Los id explícitos no avanzan la secuencia de BIGSERIAL: sin esto el siguiente
+            # INSERT sin id (carga incremental) repetiría un id existente
+            cursor.execute("SELECT setval(pg_get_serial_sequence('sentiment_analysis', 'id'), "
+                           "MAX(id)) FROM sentiment_analysis")
+        if news is not None:
+            new_titles, links = self._insert_headlines(cursor, placeholder, records['id'], news)
+            print(f"   🧩 Titulares normalizados: {links} enlaces, {new_titles} titulares nuevos")
+        return len(records)
+
+    def bulk_load(self):
+        """Carga masiva a SQLite: executemany por lotes, una transacción y pragmas configurables"""
+        try:
+            engine = self.engine
+            self.rows_loaded = self._bulk_insert(engine, self.df, replace=True)
+            self._refresh_indexes_and_rollups(engine)
+            print(f"✅ Datos cargados exitosamente a SQLite (carga masiva): {self.rows_loaded} registros insertados")
+            return True
+        except Exception as e:
+            print(f"❌ Error en la carga masiva a la base de datos: {e}")
+            return False
+
+    def load_incremental(self):
+        """Cargar solo días nuevos o modificados (upsert por fecha) conservando el esquema declarado"""
+        try:
+            if not self.create_table():
+                return False
+            
+            engine = self.engine
+            self._ensure_incremental_schema(engine)
+            self.rows_skipped = 0
+            with engine.begin() as conn:
+                inserted, updated, touched = self._upsert_changed_rows(conn, self.df)
+            self._refresh_indexes_and_rollups(engine, touched)
+            
+            self.rows_loaded = inserted + updated
+            unchanged = len(self.df) - self.rows_skipped - self.rows_loaded
+            print(f"✅ Carga incremental a SQLite: {inserted} registros nuevos, "
+                  f"{updated} actualizados, {unchanged} sin cambios, {self.rows_skipped} omitidos por fecha repetida")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error en la carga incremental: {e}")
+            return False
+
+    @contextmanager
+    def _stream_transaction(self, engine):
+        """Conexión con una sola transacción para todos los lotes: si el flujo se corta, se revierte"""
+        with engine.connect() as conn:
+            cursor = conn.connection.cursor()
+            if self.is_sqlite and (self.config.BULK_LOAD or self.normalized):
+                # El modo de journal no puede cambiarse dentro de una transacción
+                self._apply_pragmas(cursor)
+            transaction = conn.begin()
+            if self.is_sqlite:
+                # pysqlite no abre la transacción antes del DDL (DROP/CREATE de la carga 'replace')
+                cursor.execute("BEGIN")
+            try:
+                yield conn
+                transaction.commit()
+            except BaseException:
+                transaction.rollback()
+                raise
+
+    def load_stream(self, chunks, output_path, columnar_path=None, term_matrix_path=None):
+        """Cargar un flujo de lotes al CSV limpio (y a la copia columnar y la matriz documento-término)
+        y a SQLite sin materializar el dataset completo.
+
+        Todos los lotes se cargan en una transacción y los archivos se escriben
+        con un nombre temporal: si el flujo falla a mitad (por ejemplo un error
+        de codificación), la tabla y los archivos anteriores quedan intactos.
+        """
+        self.rows_loaded = 0
+        columnar = None
+        term_matrix = None
+        tmp_paths = {output_path: output_path + '.tmp'}
+        if columnar_path:
+            tmp_paths[columnar_path] = columnar_path + '.tmp'
+        try:
+            if not self.create_table():
+                return False
+            
+            # Crear directorio si no existe
+            output_dir = os.path.dirname(output_path)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+            
+            engine = self.engine
+            
+            incremental = self.config.LOAD_MODE == 'incremental'
+            touched = []
+            loaded_dates = SeenKeys()
+            self.rows_skipped = 0
+            if incremental:
+                self._ensure_incremental_schema(engine)
+            if columnar_path:
+                try:
+                    columnar = self._columnar_writer(tmp_paths[columnar_path])
+                except ImportError:
+                    print(f"⚠️ pyarrow no está instalado; no se guarda la copia {self.config.COLUMNAR_FORMAT}")
+                    del tmp_paths[columnar_path]
+            if term_matrix_path:
+                term_matrix = TermMatrixBuilder(term_matrix_path, n_features=self.config.TERM_MATRIX_FEATURES)
+            
+            with self._stream_transaction(engine) as conn:
+                for i, chunk in enumerate(chunks):
+                    first = i == 0
+                    self.df = chunk
+                    chunk.to_csv(tmp_paths[output_path], mode='w' if first else 'a', header=first, index=False)
+                    if columnar is not None:
+                        columnar.write(chunk)
+                    if term_matrix is not None:
+                        term_matrix.add_frame(chunk)
+                    if incremental:
+                        touched.append(self._upsert_changed_rows(conn, chunk, loaded_dates)[2])
+                    elif self.config.BULK_LOAD or self.normalized:
+                        self._bulk_insert_rows(conn.connection.cursor(), conn.dialect, chunk, replace=first)
+                    else:
+                        self._prepare_for_database(chunk).to_sql(
+                            'sentiment_analysis',
+                            conn,
+                            if_exists='replace' if first else 'append',
+                            index=False,
+                            method='multi',
+                            chunksize=self._multi_insert_chunksize(chunk)
+                        )
+                    self.rows_loaded += len(chunk)
+                    print(f"   💾 Lote {i + 1}: {len(chunk)} registros cargados ({self.rows_loaded} acumulados)")
+            
+            if columnar is not None:
+                columnar.close()
+            if self.rows_loaded:
+                for path, tmp_path in tmp_paths.items():
+                    os.replace(tmp_path, path)
+            # Los agregados se recalculan una sola vez, con todos los lotes cargados (en modo
+            # incremental, solo los periodos de los días que cambiaron)
+            self._refresh_indexes_and_rollups(engine, pd.concat(touched) if touched else None)
+            if term_matrix is not None:
+                term_matrix.finish()
+            
+            print(f"✅ CSV limpio guardado exitosamente en: {output_path}")
+            if columnar is not None:
+                print(f"✅ Copia {self.config.COLUMNAR_FORMAT} guardada exitosamente en: {columnar_path}")
+            if term_matrix is not None:
+                self._print_term_matrix(term_matrix)
+            print(f"✅ Datos cargados exitosamente a SQLite: {self.rows_loaded} registros insertados")
+            if self.rows_skipped:
+                print(f"⚠️ {self.rows_skipped} registros omitidos en SQLite por repetir una fecha (siguen en el CSV limpio)")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error al cargar datos por lotes: {e}")
+            return False
+        finally:
+            if columnar is not None:
+                columnar.close()
+            if term_matrix is not None:
+                term_matrix.close()
+            for tmp_path in tmp_paths.values():
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
     def save_clean_csv(self, output_path):
         """Guardar datos limpios en CSV"""
         try:
@@ -163,41 +823,198 @@ class Load:
             print(f"❌ Error al guardar el CSV limpio: {e}")
             return False
 
+    def read_rollup(self, period='monthly'):
+        """Leer una tabla de agregados ('daily', 'monthly' o 'yearly') como DataFrame"""
+        table = f"sentiment_{period}"
+        if table not in self.ROLLUP_TABLES:
+            raise ValueError(f"Periodo de agregados desconocido: {period}")
+        keys = ', '.join(self.ROLLUP_TABLES[table] + ['sentiment'])
+        return pd.read_sql(text(f"SELECT * FROM {table} ORDER BY {keys}"), self.engine)
+
+    def search_headlines(self, query, method='fts', limit=None):
+        """Fechas cuyos titulares coinciden con la búsqueda, con su etiqueta y sentimiento, ordenadas por fecha.
+
+        Con method='fts' se consulta el índice FTS5 (sintaxis de FTS5: palabras,
+        "frases", prefijos con *, AND/OR/NOT). Con method='like' se recorre la
+        tabla con LIKE '%query%' (subcadena, no palabra completa); es también el
+        respaldo cuando no existe el índice (otro motor o HEADLINE_SEARCH
+        desactivado). Con el almacenamiento normalizado la consulta se evalúa
+        sobre cada titular y no sobre el texto combinado del día.
+        """
+        if method not in ('fts', 'like'):
+            raise ValueError(f"Método de búsqueda desconocido: {method} (use 'fts' o 'like')")
+        if method == 'fts' and not (self.is_sqlite and inspect(self.engine).has_table(self.HEADLINE_INDEX)):
+            print(f"⚠️ No existe el índice '{self.HEADLINE_INDEX}' (HEADLINE_SEARCH); se busca con LIKE")
+            method = 'like'
+        
+        index = self.HEADLINE_INDEX
+        _, column, rowid = self.HEADLINE_SOURCES[self.config.HEADLINE_STORAGE]
+        if method == 'fts':
+            condition = f"{rowid} IN (SELECT rowid FROM {index} WHERE {index} MATCH :query)"
+            params = {'query': query}
+        else:
+            condition = f"{column} LIKE :pattern ESCAPE '\\'"
+            escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params = {'pattern': f"%{escaped}%"}
+        if self.normalized:
+            # Primero los titulares que coinciden y después los días en los que aparecen
+            condition = (f"id IN (SELECT analysis_id FROM sentiment_headline_links WHERE headline_id IN "
+                         f"(SELECT headline_id FROM headlines WHERE {condition}))")
+        sql = f"SELECT date, label, sentiment FROM sentiment_analysis WHERE {condition} ORDER BY date"
+        if limit:
+            sql += " LIMIT :limit"
+            params['limit'] = limit
+        return pd.read_sql(text(sql), self.engine, params=params, parse_dates=['date'])
+
+    def merge_clean_outputs(self, output_path, columnar_path=None, append=False, keys=('Date',)):
+        """Incorporar las filas transformadas (self.df) a las salidas limpias existentes.
+
+        Con append=True las filas se agregan al final del CSV; si no, las filas
+        existentes con los mismos valores en keys se reemplazan y el archivo se reescribe.
+        La copia columnar siempre se reescribe (Parquet y Feather no admiten agregar).
+        """
+        try:
+            # Crear directorio si no existe
+            output_dir = os.path.dirname(output_path)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+            
+            if append and os.path.exists(output_path):
+                self.df.to_csv(output_path, mode='a', header=False, index=False)
+            else:
+                existing = pd.read_csv(output_path, parse_dates=['Date']) if os.path.exists(output_path) else None
+                self._merge_frames(existing, keys).to_csv(output_path, index=False)
+            print(f"✅ CSV limpio actualizado: {len(self.df)} registros incorporados en {output_path}")
+            
+            if columnar_path:
+                existing = read_columnar(columnar_path) if os.path.exists(columnar_path) else None
+                with self._columnar_writer(columnar_path) as writer:
+                    writer.write(self._merge_frames(existing, keys))
+                print(f"✅ Copia {self.config.COLUMNAR_FORMAT} actualizada en: {columnar_path}")
+            return True
+        except ImportError:
+            print(f"⚠️ pyarrow no está instalado; no se actualiza la copia {self.config.COLUMNAR_FORMAT}")
+            return True
+        except Exception as e:
+            print(f"❌ Error al actualizar las salidas limpias: {e}")
+            return False
+
+    def _merge_frames(self, existing, keys=('Date',)):
+        """Filas existentes sin las claves que llegan de nuevo, seguidas de las filas nuevas"""
+        if existing is None or existing.empty:
+            return self.df
+        keys = list(keys)
+        incoming = pd.MultiIndex.from_frame(self.df[keys])
+        kept = existing[~pd.MultiIndex.from_frame(existing[keys]).isin(incoming)]
+        return pd.concat([kept, self.df], ignore_index=True)
+
+    def _columnar_writer(self, output_path):
+        return ColumnarWriter(output_path, self.config.COLUMNAR_FORMAT,
+                              compression=self.config.COLUMNAR_COMPRESSION,
+                              row_group_size=self.config.COLUMNAR_ROW_GROUP_SIZE)
+
+    def save_columnar(self, output_path):
+        """Guardar datos limpios en Parquet o Feather (conserva tipos y permite leer columnas sueltas)"""
+        try:
+            output_dir = os.path.dirname(output_path)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+            
+            with self._columnar_writer(output_path) as writer:
+                writer.write(self.df)
+            print(f"✅ Copia {self.config.COLUMNAR_FORMAT} guardada exitosamente en: {output_path}")
+            return True
+        except ImportError:
+            print(f"⚠️ pyarrow no está instalado; no se guarda la copia {self.config.COLUMNAR_FORMAT}")
+            return False
+        except Exception as e:
+            print(f"❌ Error al guardar la copia columnar: {e}")
+            return False
+
+    def save_term_matrix(self, output_path, frames=None):
+        """Guardar la matriz documento-término (conteos y TF-IDF) de los titulares con Date y Label alineados.
+
+        Por defecto usa el DataFrame transformado; frames puede ser cualquier
+        iterable de lotes, por ejemplo el CSV limpio leído por partes.
+        """
+        builder = None
+        try:
+            builder = TermMatrixBuilder(output_path, n_features=self.config.TERM_MATRIX_FEATURES)
+            for frame in ([self.df] if frames is None else frames):
+                builder.add_frame(frame)
+            builder.finish()
+            self._print_term_matrix(builder)
+            return True
+        except Exception as e:
+            print(f"❌ Error al guardar la matriz documento-término: {e}")
+            return False
+        finally:
+            if builder is not None:
+                builder.close()
+
+    def rebuild_term_matrix(self, output_path, csv_path):
+        """Reconstruir la matriz documento-término desde el CSV limpio completo, leído por lotes"""
+        frames = pd.read_csv(csv_path, chunksize=self.config.CHUNK_SIZE,
+                             usecols=lambda col: col in ('Date', 'Label', 'AllTitles') or col.startswith('Top'))
+        return self.save_term_matrix(output_path, frames)
+
+    @staticmethod
+    def _print_term_matrix(builder):
+        kind = f"hashing de {builder.n_features} columnas" if builder.vocabulary is None \
+            else f"vocabulario de {len(builder.vocabulary)} términos"
+        print(f"✅ Matriz documento-término guardada en: {builder.path} "
+              f"({builder.rows} filas, {kind}, {builder.nnz} valores no nulos)")
+
     def get_database_stats(self):
         """Obtener estadísticas de la base de datos"""
         try:
-            engine = create_engine(self.config.DATABASE_URL)
+            engine = self.engine
             
             with engine.connect() as conn:
+                # Las estadísticas se leen de la tabla anual de agregados, no de la tabla completa;
+                # sin ella (faltan year o sentiment, ver _refresh_rollups) se cuenta sobre la tabla completa
+                inspector = inspect(conn)
+                if inspector.has_table('sentiment_yearly'):
+                    source, count = 'sentiment_yearly', 'SUM(records)'
+                else:
+                    source, count = 'sentiment_analysis', 'COUNT(*)'
+                columns = {col['name'] for col in inspector.get_columns(source)}
+                
                 # Contar registros totales
-                result = conn.execute(text("SELECT COUNT(*) FROM sentiment_analysis"))
-                total_records = result.scalar()
+                result = conn.execute(text(f"SELECT {count} FROM {source}"))
+                total_records = result.scalar() or 0
                 
                 # Obtener estadísticas por sentimiento
-                sentiment_stats = conn.execute(text("""
-                    SELECT sentiment, COUNT(*) as count 
-                    FROM sentiment_analysis 
-                    GROUP BY sentiment 
-                    ORDER BY count DESC
-                """)).fetchall()
+                sentiment_stats = []
+                if 'sentiment' in columns:
+                    sentiment_stats = conn.execute(text(f"""
+                        SELECT sentiment, {count} as count 
+                        FROM {source} 
+                        GROUP BY sentiment 
+                        ORDER BY count DESC
+                    """)).fetchall()
                 
                 # Estadísticas por año
-                yearly_stats = conn.execute(text("""
-                    SELECT year, COUNT(*) as count 
-                    FROM sentiment_analysis 
-                    GROUP BY year 
-                    ORDER BY year DESC 
-                    LIMIT 5
-                """)).fetchall()
+                yearly_stats = []
+                if 'year' in columns:
+                    yearly_stats = conn.execute(text(f"""
+                        SELECT year, {count} as count 
+                        FROM {source} 
+                        GROUP BY year 
+                        ORDER BY year DESC 
+                        LIMIT 5
+                    """)).fetchall()
                 
                 print(f"📊 Estadísticas de la base de datos:")
                 print(f"   - Total de registros: {total_records}")
-                print(f"   - Distribución por sentimiento:")
-                for sentiment, count in sentiment_stats:
-                    print(f"     • {sentiment}: {count} registros")
-                print(f"   - Top 5 años con más datos:")
-                for year, count in yearly_stats:
-                    print(f"     • {year}: {count} registros")
+                if sentiment_stats:
+                    print(f"   - Distribución por sentimiento:")
+                    for sentiment, records in sentiment_stats:
+                        print(f"     • {sentiment}: {records} registros")
+                if yearly_stats:
+                    print(f"   - Top 5 años con más datos:")
+                    for year, records in yearly_stats:
+                        print(f"     • {year}: {records} registros")
                 
                 return True
                 
@@ -0,0 +1,62 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SinkExecutor:
+    """Escribe el DataFrame transformado en todas las salidas configuradas a la vez.
+
+    Cada salida (CSV limpio, copia columnar, base de datos) se registra con
+    add() como una función sin argumentos que devuelve True/False. Con
+    max_workers > 1 las salidas corren en un pool de hilos: son sobre todo
+    E/S (escritura de archivos, SQLite libera el GIL al ejecutar sentencias),
+    así que la fase de carga tiende a durar lo que la salida más lenta y no la
+    suma. Los errores se capturan por salida: una salida que falla no
+    interrumpe a las demás, y solo las marcadas como required hacen fallar run().
+    """
+
+    def __init__(self, max_workers=1, profiler=None):
+        self.max_workers = max_workers
+        self.profiler = profiler
+        self.sinks = []
+        self.results = {}
+
+    def add(self, name, func, rows=None, required=True):
+        """Registrar una salida; name es también el nombre de la etapa en el profiler ('load.csv')"""
+        self.sinks.append({'name': name, 'func': func, 'rows': rows, 'required': required})
+        return self
+
+    def _run_sink(self, sink):
+        start = time.perf_counter()
+        error = None
+        try:
+            if self.profiler is not None:
+                with self.profiler.stage(sink['name'], rows=sink['rows']):
+                    ok = bool(sink['func']())
+            else:
+                ok = bool(sink['func']())
+        except Exception as e:
+            ok, error = False, str(e)
+            print(f"❌ Error en la salida {sink['name']}: {e}")
+        return {'ok': ok, 'required': sink['required'], 'wall_s': round(time.perf_counter() - start, 4),
+                'error': error}
+
+    def run(self):
+        """Ejecutar todas las salidas; True si las obligatorias terminaron bien"""
+        workers = min(self.max_workers, len(self.sinks))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sink') as executor:
+                results = list(executor.map(self._run_sink, self.sinks))
+        else:
+            results = [self._run_sink(sink) for sink in self.sinks]
+        self.results = {sink['name']: result for sink, result in zip(self.sinks, results)}
+
+        mode = f"en paralelo ({workers} hilos)" if workers > 1 else "en secuencia"
+        print(f"⏱️ Salidas escritas {mode}:")
+        for name, result in self.results.items():
+            status = '✅' if result['ok'] else ('❌' if result['required'] else '⚠️')
+            print(f"   {status} {name}: {result['wall_s']:.2f} s")
+        return all(result['ok'] for result in self.results.values() if result['required'])
+
+    def failed(self):
+        """Nombres de las salidas obligatorias que fallaron"""
+        return [name for name, result in self.results.items() if result['required'] and not result['ok']]
@@ -1,11 +1,41 @@
-from config.settings import Settings
-from extract.extract import Extract
-from transform.transform import Transform
-from load.load import Load
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+import argparse
 import os
+import sys
+
+from monitoring.imports import timed_import, import_times, importtime_summary
+
+# Solo se importa al inicio lo que usan todas las fases; matplotlib/seaborn y
+# SQLAlchemy se cargan al llegar a la etapa que los necesita
+with timed_import('inicio'):
+    from config.settings import Settings
+    from extract.extract import Extract
+    from extract.checkpoint import Checkpoint
+    from transform.transform import Transform
+    from load.columnar import read_columnar
+    from monitoring.profiler import StageProfiler
+    import pandas as pd
+
+# Subcomandos de la línea de comandos y módulos pesados que importa cada uno
+COMMANDS = {
+    'extract': 'Solo extracción: lee el CSV de entrada y muestra el resumen',
+    'transform': 'Extracción y transformación sin escribir salidas (validación y tiempos)',
+    'load': 'ETL completo sin gráficas: CSV limpio, copia columnar y base de datos',
+    'graphs': 'Solo gráficas EDA a partir de las salidas limpias existentes',
+    'all': 'ETL completo y gráficas EDA (por defecto)',
+}
+COMMAND_MODULES = {
+    'extract': ['extract.extract'],
+    'transform': ['transform.transform'],
+    'load': ['transform.transform', 'load.load'],
+    'graphs': ['load.columnar', 'visualize.graphs'],
+    'all': ['transform.transform', 'load.load', 'visualize.graphs'],
+}
+
+# Columnas que consumen las gráficas EDA (sin los textos de noticias)
+GRAPH_COLUMNS = [
+    'Date', 'Year', 'DayOfWeek', 'Label', 'Sentiment', 'ValidTitles',
+    'AvgTitleLength', 'FinancialKeywords', 'PositiveKeywords', 'NegativeKeywords'
+]
 
 def create_graphs_directory():
     """Crear directorio para gráficas si no existe"""
@@ -15,251 +45,345 @@ def create_graphs_directory():
         print(f"📁 Directorio 'graphs' creado")
     return graph_dir
 
-def generate_eda_graphs(df, graph_dir):
-    """Generar 5 gráficas de análisis exploratorio de datos"""
+def generate_eda_graphs(df, graph_dir, config=None):
+    """Generar las gráficas de análisis exploratorio de datos a partir de agregados precalculados"""
+    config = config or Settings()
     print("\n📊 GENERANDO GRÁFICAS DE ANÁLISIS EXPLORATORIO...")
-    sns.set_style("whitegrid")
-    plt.rcParams['figure.figsize'] = (12, 8)
-    plt.rcParams['font.size'] = 10
-    
-    graphs_created = []
+    with timed_import('graficas'):
+        from visualize.graphs import aggregate_graph_inputs, render_graphs
+    inputs = aggregate_graph_inputs(df, max_scatter_points=config.GRAPH_SCATTER_MAX_POINTS)
+    return render_graphs(inputs, graph_dir, image_format=config.GRAPH_FORMAT,
+                         dpi=config.GRAPH_DPI, workers=config.GRAPH_WORKERS,
+                         cache_path=config.GRAPH_CACHE_PATH)
 
-    # Gráfica 1: Distribución de sentimientos por año
-    if {'Year', 'Sentiment'}.issubset(df.columns):
-        plt.figure(figsize=(14, 8))
-        sentiment_year = df.groupby(['Year', 'Sentiment']).size().unstack(fill_value=0)
-        sentiment_year.plot(kind='bar', stacked=True, color=['#ff6b6b', '#4ecdc4'])
-        plt.title('Distribución de Sentimientos por Año', fontsize=16, fontweight='bold')
-        plt.xlabel('Año', fontsize=12)
-        plt.ylabel('Número de Registros', fontsize=12)
-        plt.legend(title='Sentimiento', bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plot1_path = os.path.join(graph_dir, '01_distribucion_sentimientos_por_anio.png')
-        plt.savefig(plot1_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        graphs_created.append(plot1_path)
+def graph_frame(df):
+    """Columnas del DataFrame en memoria que usan las gráficas, sin los textos de noticias"""
+    return df[[col for col in GRAPH_COLUMNS if col in df.columns]]
 
-    # Gráfica 2: Sentimientos por día de la semana
-    if {'DayOfWeek', 'Sentiment'}.issubset(df.columns):
-        plt.figure(figsize=(12, 8))
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        df_clean = df[df['DayOfWeek'].isin(day_order)]
-        
-        # Crear tabla de contingencia
-        crosstab = pd.crosstab(df_clean['DayOfWeek'], df_clean['Sentiment'])
-        crosstab = crosstab.reindex(day_order)
-        
-        # Gráfico de barras apiladas
-        ax = crosstab.plot(kind='bar', stacked=True, color=['#ff6b6b', '#4ecdc4'])
-        plt.title('Distribución de Sentimientos por Día de la Semana', fontsize=16, fontweight='bold')
-        plt.xlabel('Día de la Semana', fontsize=12)
-        plt.ylabel('Número de Registros', fontsize=12)
-        plt.legend(title='Sentimiento', bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plot2_path = os.path.join(graph_dir, '02_sentimientos_por_dia_semana.png')
-        plt.savefig(plot2_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        graphs_created.append(plot2_path)
+def read_graph_data(path):
+    """Leer del archivo limpio solo las columnas de las gráficas (respaldo cuando no hay DataFrame en memoria)"""
+    if not path.endswith('.csv'):
+        # Parquet/Feather: lectura por columnas con tipos ya conservados
+        return read_columnar(path, columns=GRAPH_COLUMNS)
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [col for col in GRAPH_COLUMNS if col in header]
+    try:
+        import pyarrow  # noqa: F401
+        engine = 'pyarrow'  # lector columnar y multihilo
+    except ImportError:
+        engine = 'c'
+    df = pd.read_csv(path, usecols=usecols, engine=engine)
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df
 
-    # Gráfica 3: Evolución temporal del sentimiento
-    if {'Date', 'Label'}.issubset(df.columns):
-        plt.figure(figsize=(16, 8))
-        df_temp = df.copy()
-        df_temp['Date'] = pd.to_datetime(df_temp['Date'])
-        df_temp = df_temp.sort_values('Date')
-        
-        # Calcular media móvil de 30 días
-        df_temp['Sentiment_MA'] = df_temp['Label'].rolling(window=30, min_periods=1).mean()
-        
-        plt.subplot(2, 1, 1)
-        plt.plot(df_temp['Date'], df_temp['Sentiment_MA'], linewidth=2, color='#2E86AB')
-        plt.title('Evolución del Sentimiento (Media Móvil 30 días)', fontsize=14, fontweight='bold')
-        plt.ylabel('Sentimiento Promedio', fontsize=12)
-        plt.grid(True, alpha=0.3)
-        
-        # Distribución mensual
-        plt.subplot(2, 1, 2)
-        monthly_sentiment = df_temp.groupby(df_temp['Date'].dt.to_period('M'))['Label'].mean()
-        monthly_sentiment.plot(kind='line', marker='o', color='#A23B72')
-        plt.title('Sentimiento Promedio por Mes', fontsize=14, fontweight='bold')
-        plt.xlabel('Fecha', fontsize=12)
-        plt.ylabel('Sentimiento Promedio', fontsize=12)
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        
-        plt.tight_layout()
-        plot3_path = os.path.join(graph_dir, '03_evolucion_temporal_sentimiento.png')
-        plt.savefig(plot3_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        graphs_created.append(plot3_path)
+def run_eda(config, df=None):
+    """Generar las gráficas EDA a partir del DataFrame transformado o, si no se pasa, del CSV limpio"""
+    graph_dir = create_graphs_directory()
+    try:
+        if df is not None:
+            df_plot = graph_frame(df)
+        else:
+            # Preferir la copia columnar si existe
+            columnar_path = config.COLUMNAR_OUTPUT_PATH
+            use_columnar = columnar_path and os.path.exists(columnar_path)
+            df_plot = read_graph_data(columnar_path if use_columnar else config.OUTPUT_PATH)
+    except Exception as e:
+        print(f"❌ Error al leer datos para gráficas: {e}")
+        return None
+    return generate_eda_graphs(df_plot, graph_dir, config)
 
-    # Gráfica 4: Análisis de palabras clave por sentimiento
-    if {'Sentiment', 'FinancialKeywords', 'PositiveKeywords', 'NegativeKeywords'}.issubset(df.columns):
-        plt.figure(figsize=(14, 10))
-        
-        # Preparar datos
-        keywords_data = df.groupby('Sentiment')[['FinancialKeywords', 'PositiveKeywords', 'NegativeKeywords']].mean()
-        
-        # Gráfico de calor
-        plt.subplot(2, 2, 1)
-        sns.heatmap(keywords_data.T, annot=True, cmap='RdYlBu_r', fmt='.2f', cbar_kws={'label': 'Promedio de Palabras'})
-        plt.title('Promedio de Palabras Clave por Sentimiento', fontsize=12, fontweight='bold')
-        plt.xlabel('Sentimiento')
-        plt.ylabel('Tipo de Palabras')
-        
-        # Distribución de palabras financieras
-        plt.subplot(2, 2, 2)
-        sns.boxplot(data=df, x='Sentiment', y='FinancialKeywords')
-        plt.title('Distribución de Palabras Financieras', fontsize=12, fontweight='bold')
-        plt.xlabel('Sentimiento')
-        plt.ylabel('Número de Palabras Financieras')
-        
-        # Distribución de palabras positivas vs negativas
-        plt.subplot(2, 2, 3)
-        sentiment_keywords = df.groupby('Sentiment')[['PositiveKeywords', 'NegativeKeywords']].mean()
-        sentiment_keywords.plot(kind='bar', color=['#4ecdc4', '#ff6b6b'])
-        plt.title('Palabras Positivas vs Negativas por Sentimiento', fontsize=12, fontweight='bold')
-        plt.xlabel('Sentimiento')
-        plt.ylabel('Promedio de Palabras')
-        plt.legend(['Positivas', 'Negativas'])
-        plt.xticks(rotation=0)
-        
-        # Correlación entre tipos de palabras
-        plt.subplot(2, 2, 4)
-        correlation_data = df[['FinancialKeywords', 'PositiveKeywords', 'NegativeKeywords']].corr()
-        sns.heatmap(correlation_data, annot=True, cmap='coolwarm', center=0, fmt='.2f')
-        plt.title('Correlación entre Tipos de Palabras', fontsize=12, fontweight='bold')
-        
-        """
-        plt.tight_layout()
-        plot4_path = os.path.join(graph_dir, '04_analisis_palabras_clave.png')
-        plt.savefig(plot4_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        graphs_created.append(plot4_path)
-        """
+def run_streaming_etl(config, profiler, command='all'):
+    """Ejecutar extracción, transformación y carga por lotes con memoria acotada"""
+    if command in ('extract', 'transform'):
+        return run_streaming_dry_run(config, profiler, command)
+    with timed_import('base_de_datos'):
+        from load.load import Load
+    print(f"\n🌊 --- FASES 1-3: ETL POR LOTES ({config.CHUNK_SIZE} registros por lote) ---")
+    extractor = Extract(config.INPUT_PATH)
+    transformer = Transform(profiler=profiler)
+    loader = Load(config=config)
+    
+    # Las fases se intercalan lote a lote: se mide el flujo completo y los pasos de transformación
+    stage = profiler.begin('etl_stream')
+    chunks = transformer.clean_chunks(extractor.extract_chunks(config.CHUNK_SIZE))
+    loaded = loader.load_stream(chunks, config.OUTPUT_PATH, config.COLUMNAR_OUTPUT_PATH, config.TERM_MATRIX_PATH)
+    profiler.end(stage, rows=extractor.rows_extracted)
+    if not loaded:
+        print("❌ Error en la carga por lotes. Terminando proceso ETL.")
+        return None
+    
+    if loader.rows_loaded == 0:
+        print("❌ No se cargaron registros. Terminando proceso ETL.")
+        return None
+    
+    # Mostrar estadísticas de la base de datos
+    with profiler.stage('load.stats'):
+        loader.get_database_stats()
+    return extractor.rows_extracted, transformer.rows_transformed
 
-    # Gráfica 5: Análisis de longitud de títulos y cantidad de noticias
-    if {'Sentiment', 'AvgTitleLength', 'ValidTitles'}.issubset(df.columns):
-        plt.figure(figsize=(16, 8))
-        
-        # Longitud promedio de títulos por sentimiento
-        plt.subplot(2, 2, 1)
-        sns.boxplot(data=df, x='Sentiment', y='AvgTitleLength')
-        plt.title('Distribución de Longitud Promedio de Títulos', fontsize=12, fontweight='bold')
-        plt.xlabel('Sentimiento')
-        plt.ylabel('Longitud Promedio de Títulos')
-        
-        # Cantidad de títulos válidos por sentimiento
-        plt.subplot(2, 2, 2)
-        sns.boxplot(data=df, x='Sentiment', y='ValidTitles')
-        plt.title('Distribución de Títulos Válidos por Día', fontsize=12, fontweight='bold')
-        plt.xlabel('Sentimiento')
-        plt.ylabel('Número de Títulos Válidos')
-        
-        # Relación entre longitud y cantidad de títulos
-        plt.subplot(2, 2, 3)
-        sns.scatterplot(data=df, x='ValidTitles', y='AvgTitleLength', hue='Sentiment', alpha=0.6)
-        plt.title('Relación entre Títulos Válidos y Longitud Promedio', fontsize=12, fontweight='bold')
-        plt.xlabel('Número de Títulos Válidos')
-        plt.ylabel('Longitud Promedio de Títulos')
-        
-        # Distribución temporal de títulos válidos
-        plt.subplot(2, 2, 4)
-        if 'Year' in df.columns:
-            yearly_titles = df.groupby(['Year', 'Sentiment'])['ValidTitles'].mean().unstack(fill_value=0)
-            yearly_titles.plot(kind='line', marker='o', color=['#ff6b6b', '#4ecdc4'])
-            plt.title('Promedio de Títulos Válidos por Año', fontsize=12, fontweight='bold')
-            plt.xlabel('Año')
-            plt.ylabel('Promedio de Títulos Válidos')
-            plt.legend(title='Sentimiento')
-        
-        plt.tight_layout()
-        plot5_path = os.path.join(graph_dir, '05_analisis_titulos_noticias.png')
-        plt.savefig(plot5_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        graphs_created.append(plot5_path)
+def run_streaming_dry_run(config, profiler, command):
+    """Recorrer los lotes sin escribir salidas: solo extracción o extracción y transformación"""
+    print(f"\n🌊 --- ETL POR LOTES SIN CARGA ({config.CHUNK_SIZE} registros por lote) ---")
+    extractor = Extract(config.INPUT_PATH)
+    transformer = Transform(profiler=profiler)
+    stage = profiler.begin('etl_stream')
+    chunks = extractor.extract_chunks(config.CHUNK_SIZE)
+    if command == 'transform':
+        chunks = transformer.clean_chunks(chunks)
+    try:
+        for _ in chunks:
+            pass
+    except Exception as e:
+        print(f"❌ Lectura por lotes interrumpida: {e}. Terminando proceso ETL.")
+        return None
+    finally:
+        profiler.end(stage, rows=extractor.rows_extracted)
+    if extractor.rows_extracted == 0:
+        print("❌ No se pudo extraer datos. Terminando proceso ETL.")
+        return None
+    return extractor.rows_extracted, transformer.rows_transformed
 
-    return graphs_created
+def run_incremental_etl(config, profiler, command='all'):
+    """Procesar solo las filas nuevas o modificadas del CSV de entrada desde el último checkpoint.
 
-def main():
-    print("🚀 === INICIANDO PROCESO ETL PARA ANÁLISIS DE SENTIMIENTO ===")
+    Con los subcomandos extract y transform el delta se procesa sin cargarlo
+    y sin actualizar el checkpoint.
+    """
+    print("\n🔁 --- FASES 1-3: ETL INCREMENTAL ---")
+    checkpoint = Checkpoint(config.CHECKPOINT_PATH)
+    # Sin salidas previas no hay dónde incorporar el delta: se procesa todo
+    outputs_exist = os.path.exists(config.OUTPUT_PATH)
+    if not (outputs_exist and checkpoint.load(config.INPUT_PATH)):
+        checkpoint = Checkpoint(config.CHECKPOINT_PATH)
     
-    # Configuración
-    config = Settings()
-    print(f"📁 Archivo de entrada: {config.INPUT_PATH}")
-    print(f"📁 Archivo de salida: {config.OUTPUT_PATH}")
-    print(f"🗄️ Base de datos: {config.DATABASE_URL}")
+    extractor = Extract(config.INPUT_PATH)
+    stage = profiler.begin('extract')
+    df, change = extractor.extract_delta(checkpoint)
+    profiler.end(stage, rows=0 if df is None else len(df))
+    if df is None:
+        print("❌ No se pudo extraer datos. Terminando proceso ETL.")
+        return None
+    if change == 'unchanged' or command == 'extract':
+        return extractor.rows_extracted, 0
+    
+    transformed_count = 0
+    max_date = checkpoint.state.get('max_date')
+    if len(df) > 0:
+        transformer = Transform(df, profiler=profiler)
+        with profiler.stage('transform', rows=len(df)):
+            df_transformed = transformer.clean(verbose=False)
+        transformed_count = len(df_transformed)
+        print(f"✅ Transformación del delta: {transformed_count} registros")
+    if command == 'transform':
+        return extractor.rows_extracted, transformed_count
+    
+    if transformed_count > 0:
+        with timed_import('base_de_datos'):
+            from load.load import Load
+            from load.sinks import SinkExecutor
+        loader = Load(df_transformed, config=config)
+        # Solo se agrega al final si todas las fechas son posteriores a las ya procesadas
+        append = change == 'append' and max_date is not None and \
+            df_transformed['Date'].min() > pd.Timestamp(max_date)
+        # Un archivo reescrito reenvía fechas completas; las filas agregadas solo reemplazan su (fecha, etiqueta)
+        keys = ('Date', 'Label') if change == 'append' else ('Date',)
+        # Salidas limpias y base de datos a la vez; si una falla el checkpoint no se guarda
+        # y la siguiente ejecución vuelve a aplicar el delta (ambas cargas son idempotentes)
+        sinks = SinkExecutor(config.LOAD_SINK_THREADS, profiler)
+        sinks.add('load.outputs', lambda: loader.merge_clean_outputs(
+            config.OUTPUT_PATH, config.COLUMNAR_OUTPUT_PATH, append=append, keys=keys), transformed_count)
+        sinks.add('load.database', loader.load_incremental, transformed_count)
+        with profiler.stage('load', rows=transformed_count):
+            loaded = sinks.run()
+        if not loaded:
+            print(f"❌ Error al cargar el delta ({', '.join(sinks.failed())}). Terminando proceso ETL.")
+            return None
+        # TF-IDF depende de todas las filas: la matriz se reconstruye desde el CSV limpio ya actualizado
+        if config.TERM_MATRIX_PATH:
+            with profiler.stage('load.term_matrix'):
+                loader.rebuild_term_matrix(config.TERM_MATRIX_PATH, config.OUTPUT_PATH)
+        new_max = df_transformed['Date'].max()
+        max_date = str(max(new_max, pd.Timestamp(max_date)) if max_date else new_max)
+        with profiler.stage('load.stats'):
+            loader.get_database_stats()
     
+    # El checkpoint se actualiza solo cuando el delta quedó cargado
+    checkpoint.save(config.INPUT_PATH, extractor.stat, df.columns, extractor.encoding,
+                    extractor.row_hashes, replace_hashes=change == 'rewritten', max_date=max_date)
+    return extractor.rows_extracted, transformed_count
+
+def run_batch_etl(config, profiler, command):
+    """Extracción, transformación y carga en memoria; se detiene en la fase que pide el subcomando.
+
+    Devuelve (registros extraídos, registros transformados, DataFrame transformado) o None si falla.
+    """
     # 1. EXTRACCIÓN
     print("\n🔍 --- FASE 1: EXTRACCIÓN ---")
     extractor = Extract(config.INPUT_PATH)
+    stage = profiler.begin('extract')
     df = extractor.extract()
+    profiler.end(stage, rows=0 if df is None else len(df))
     if df is None:
         print("❌ No se pudo extraer datos. Terminando proceso ETL.")
-        return
+        return None
     
     print(f"✅ Extracción exitosa: {len(df)} registros extraídos")
+    if command == 'extract':
+        return len(df), 0, None
 
     # 2. TRANSFORMACIÓN
     print("\n🔄 --- FASE 2: TRANSFORMACIÓN ---")
-    transformer = Transform(df)
-    df_transformed = transformer.clean()
+    transformer = Transform(df, profiler=profiler)
+    with profiler.stage('transform', rows=len(df)):
+        df_transformed = transformer.clean()
     
     if df_transformed is None or len(df_transformed) == 0:
         print("❌ Error en la transformación. Terminando proceso ETL.")
-        return
+        return None
     
     print(f"✅ Transformación exitosa: {len(df_transformed)} registros transformados")
+    # El DataFrame crudo ya no se usa: se libera antes de la carga para bajar el pico de memoria
+    extracted_count = len(df)
+    del df
+    if command == 'transform':
+        return extracted_count, len(df_transformed), df_transformed
 
     # 3. CARGA
     print("\n💾 --- FASE 3: CARGA ---")
-    loader = Load(df_transformed)
+    with timed_import('base_de_datos'):
+        from load.load import Load
+        from load.sinks import SinkExecutor
+    loader = Load(df_transformed, config=config)
+    rows = len(df_transformed)
     
-    # Guardar CSV limpio
-    if not loader.save_clean_csv(config.OUTPUT_PATH):
-        print("❌ Error al guardar CSV limpio. Terminando proceso ETL.")
-        return
-    
-    # Cargar a base de datos SQLite
-    if not loader.load_to_database():
-        print("❌ Error al cargar datos a la base de datos. Terminando proceso ETL.")
-        return
+    # CSV limpio, copia columnar y matriz documento-término opcionales y base de datos se escriben
+    # a la vez; si falla una salida opcional el ETL continúa con el CSV
+    sinks = SinkExecutor(config.LOAD_SINK_THREADS, profiler)
+    sinks.add('load.csv', lambda: loader.save_clean_csv(config.OUTPUT_PATH), rows)
+    if config.COLUMNAR_FORMAT:
+        sinks.add('load.columnar', lambda: loader.save_columnar(config.COLUMNAR_OUTPUT_PATH), rows, required=False)
+    if config.TERM_MATRIX_PATH:
+        sinks.add('load.term_matrix', lambda: loader.save_term_matrix(config.TERM_MATRIX_PATH), rows, required=False)
+    sinks.add('load.database', loader.load_to_database, rows)
+    with profiler.stage('load', rows=rows):
+        loaded = sinks.run()
+    if not loaded:
+        print(f"❌ Error al guardar las salidas ({', '.join(sinks.failed())}). Terminando proceso ETL.")
+        return None
     
     # Mostrar estadísticas de la base de datos
-    loader.get_database_stats()
+    with profiler.stage('load.stats'):
+        loader.get_database_stats()
+    return extracted_count, len(df_transformed), df_transformed
 
-    # 4. GENERACIÓN DE GRÁFICAS
-    print("\n📊 --- FASE 4: ANÁLISIS EXPLORATORIO ---")
-    graph_dir = create_graphs_directory()
-    
-    # Leer datos limpios para gráficas
-    try:
-        df_plot = pd.read_csv(config.OUTPUT_PATH)
-        df_plot['Date'] = pd.to_datetime(df_plot['Date'])
-    except Exception as e:
-        print(f"❌ Error al leer datos para gráficas: {e}")
-        return
+def main(command='all', importtime=False):
+    print("🚀 === INICIANDO PROCESO ETL PARA ANÁLISIS DE SENTIMIENTO ===")
     
-    # Generar gráficas EDA
-    graphs_created = generate_eda_graphs(df_plot, graph_dir)
+    # Configuración
+    config = Settings()
+    print(f"⚙️ Subcomando: {command} ({COMMANDS[command]})")
+    print(f"📁 Archivo de entrada: {config.INPUT_PATH}")
+    print(f"📁 Archivo de salida: {config.OUTPUT_PATH}")
+    if command in ('load', 'all'):
+        print(f"🗄️ Base de datos: {config.DATABASE_URL}")
+    profiler = StageProfiler(track_memory=config.PROFILE_MEMORY, profile_dir=config.PROFILE_DIR)
     
-    if graphs_created:
-        print("✅ Gráficas EDA generadas exitosamente:")
-        for i, graph_path in enumerate(graphs_created, 1):
-            print(f"   {i}. {graph_path}")
-    else:
-        print("⚠️ No se generaron gráficas; faltan columnas necesarias en el dataset.")
+    extracted_count = transformed_count = 0
+    df_transformed = None
+    if command != 'graphs':
+        if config.INCREMENTAL_ETL or config.STREAMING_MODE:
+            if config.INCREMENTAL_ETL:
+                counts = run_incremental_etl(config, profiler, command)
+            else:
+                counts = run_streaming_etl(config, profiler, command)
+            if counts is None:
+                return
+            extracted_count, transformed_count = counts
+        else:
+            result = run_batch_etl(config, profiler, command)
+            if result is None:
+                return
+            extracted_count, transformed_count, df_transformed = result
+
+    graphs_created = None
+    if command in ('graphs', 'all'):
+        # 4. GENERACIÓN DE GRÁFICAS
+        print("\n📊 --- FASE 4: ANÁLISIS EXPLORATORIO ---")
+        
+        # Generar gráficas EDA con el DataFrame en memoria; en modo streaming, incremental
+        # o con el subcomando graphs se leen del CSV limpio solo las columnas necesarias
+        with profiler.stage('graphs', rows=transformed_count or None):
+            graphs_created = run_eda(config, df_transformed)
+        if graphs_created is None:
+            return
+        
+        if graphs_created:
+            print("✅ Gráficas EDA generadas exitosamente:")
+            for i, graph_path in enumerate(graphs_created, 1):
+                print(f"   {i}. {graph_path}")
+        else:
+            print("⚠️ No se generaron gráficas; faltan columnas necesarias en el dataset.")
 
     print("\n🎉 === PROCESO ETL COMPLETADO EXITOSAMENTE ===")
     print("📋 Resumen del proceso:")
-    print(f"   • Datos extraídos: {len(df)} registros")
-    print(f"   • Datos transformados: {len(df_transformed)} registros")
-    print(f"   • CSV limpio guardado en: {config.OUTPUT_PATH}")
-    print(f"   • Base de datos SQLite: {config.DATABASE_URL}")
-    print(f"   • Gráficas EDA: {len(graphs_created)} gráficas en carpeta 'graphs/'")
+    if command != 'graphs':
+        print(f"   • Datos extraídos: {extracted_count} registros")
+    if command not in ('extract', 'graphs'):
+        print(f"   • Datos transformados: {transformed_count} registros")
+    if command in ('load', 'all'):
+        print(f"   • CSV limpio guardado en: {config.OUTPUT_PATH}")
+        if config.COLUMNAR_FORMAT:
+            print(f"   • Copia {config.COLUMNAR_FORMAT}: {config.COLUMNAR_OUTPUT_PATH}")
+        if config.TERM_MATRIX_PATH:
+            print(f"   • Matriz documento-término: {config.TERM_MATRIX_PATH}")
+        print(f"   • Base de datos SQLite: {config.DATABASE_URL}")
+    if graphs_created is not None:
+        print(f"   • Gráficas EDA: {len(graphs_created)} gráficas en carpeta 'graphs/'")
+    
+    # Resumen de -X importtime en un intérprete nuevo (opcional: cuesta un arranque extra)
+    importtime_report = importtime_summary(
+        COMMAND_MODULES[command], cwd=os.path.dirname(os.path.abspath(__file__))) if importtime else None
+    
+    # Informe de rendimiento por etapa (JSON) para comparar ejecuciones
+    report_path = profiler.write_report(
+        config.RUN_REPORT_DIR, input_path=config.INPUT_PATH, streaming=config.STREAMING_MODE,
+        rows_extracted=extracted_count, rows_transformed=transformed_count,
+        command=command, import_times=dict(import_times), importtime=importtime_report,
+    )
+    print("⏱️ Tiempo por etapa:")
+    for record in profiler.records.values():
+        if '.' not in record['stage'] or record['stage'].startswith('load.'):
+            print(f"   • {record['stage']}: {record['wall_s']:.2f} s (CPU {record['cpu_s']:.2f} s)")
+    print("📦 Tiempo de importación:")
+    for name, seconds in import_times.items():
+        print(f"   • {name}: {seconds:.2f} s")
+    if importtime_report:
+        print(f"   • -X importtime ({', '.join(importtime_report['modules'])}): "
+              f"{importtime_report['total_s']:.2f} s")
+        for entry in importtime_report['top'][:5]:
+            print(f"      - {entry['module']}: {entry['cumulative_s']:.2f} s")
+    if report_path:
+        print(f"   • Informe de ejecución: {report_path}")
     print("\n✨ El proyecto está listo para análisis de sentimiento financiero!")
+    return True
+
+def parse_args(argv=None):
+    """Argumentos de línea de comandos: subcomando (por defecto all) y opciones de medición"""
+    parser = argparse.ArgumentParser(description="ETL para análisis de sentimiento de noticias financieras")
+    parser.add_argument('command', nargs='?', default='all', choices=list(COMMANDS),
+                        help='; '.join(f"{name}: {text}" for name, text in COMMANDS.items()))
+    parser.add_argument('--importtime', action='store_true',
+                        help="Agregar al informe un resumen de -X importtime de los módulos del subcomando")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    try:
+        completed = main(args.command, importtime=args.importtime)
+    finally:
+        # Cerrar las conexiones del pool compartido, solo si alguna etapa cargó la base de datos
+        database = sys.modules.get('load.database')
+        if database is not None:
+            database.DatabaseManager.dispose_all()
+    # Código de salida distinto de cero si alguna fase falló
+    sys.exit(0 if completed else 1)
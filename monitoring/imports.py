@@ -0,0 +1,60 @@
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+# Segundos de pared de cada grupo de importaciones medido con timed_import, en orden de ejecución
+import_times = {}
+
+
+@contextmanager
+def timed_import(name):
+    """Medir un bloque de imports: with timed_import('graficas'): from visualize.graphs import ...
+
+    Si los módulos ya estaban cargados el tiempo es ~0; las mediciones
+    repetidas de un mismo grupo se suman.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        import_times[name] = round(import_times.get(name, 0.0) + time.perf_counter() - start, 4)
+
+
+def importtime_summary(modules, top=10, cwd=None):
+    """Importar los módulos en un intérprete nuevo con -X importtime y resumir el árbol.
+
+    Devuelve el total y los `top` módulos con mayor tiempo acumulado entre los
+    importados directamente por cada módulo pedido (sin la caché del proceso
+    actual, por eso se usa un subproceso que corre en `cwd`, la raíz del
+    proyecto). None si el subproceso falla.
+    """
+    code = '; '.join(f"import {module}" for module in modules)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, cwd=cwd)
+    if result.returncode != 0:
+        print(f"⚠️ No se pudo medir -X importtime: {result.stderr.strip().splitlines()[-1:]}")
+        return None
+
+    entries = []
+    for line in result.stderr.splitlines():
+        # Formato: "import time: <propio us> | <acumulado us> | <sangría><módulo>"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        # Un espacio separa la columna y cada nivel de anidamiento agrega dos más
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+
+    # Los módulos de nivel superior (sangría mínima) suman el tiempo total de importación
+    min_depth = min((depth for depth, *_ in entries), default=0)
+    top_level = [entry for entry in entries if entry[0] == min_depth]
+    # Detalle: hijos directos de los módulos pedidos, para saber qué dependencia pesa
+    children = [entry for entry in entries if entry[0] <= min_depth + 1]
+    children.sort(key=lambda entry: entry[3], reverse=True)
+    return {
+        'modules': list(modules),
+        'total_s': round(sum(entry[3] for entry in top_level), 4),
+        'top': [{'module': name, 'cumulative_s': round(cumulative, 4), 'self_s': round(own, 4)}
+                for _, name, own, cumulative in children[:top]],
+    }
@@ -0,0 +1,176 @@
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _max_rss_mb():
+    """Pico de memoria residente del proceso hasta ahora (ru_maxrss está en KB en Linux)"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def current_rss_mb():
+    """Memoria residente actual del proceso (psutil si está instalado, si no /proc en Linux)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError):
+        return None
+
+
+def _rss_peak_mb(start, end):
+    """Pico de memoria residente de una etapa a partir de las muestras (actual, máximo) al abrirla y cerrarla.
+
+    Si el máximo del proceso (ru_maxrss) subió durante la etapa, el nuevo
+    máximo es el pico de la etapa; si no, se usa la mayor memoria residente
+    medida al abrirla o cerrarla (una cota inferior del pico).
+    """
+    (rss_start, max_start), (rss_end, max_end) = start, end
+    if max_start is not None and max_end is not None and max_end > max_start:
+        return max_end
+    samples = [rss for rss in (rss_start, rss_end) if rss is not None]
+    return max(samples) if samples else None
+
+
+class StageProfiler:
+    """Mide tiempo de pared, tiempo de CPU, memoria pico y filas/segundo por etapa.
+
+    Las mediciones de una etapa que se repite (p. ej. 'transform.titulos' en cada lote) se acumulan.
+    """
+
+    def __init__(self, enabled=True, track_memory=False, profile_dir=None):
+        self.enabled = enabled
+        self.track_memory = track_memory and enabled
+        self.profile_dir = profile_dir if enabled else None
+        self.started_at = datetime.now()
+        self.records = {}
+        # Etapas abiertas en todos los hilos
+        self._open = []
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _record(self, name):
+        if name not in self.records:
+            self.records[name] = {'stage': name, 'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0,
+                                  'rows': None, 'peak_memory_mb': None}
+            if not self.track_memory:
+                self.records[name]['rss_delta_mb'] = None
+        return self.records[name]
+
+    def _collect_peak(self):
+        """Llevar el pico de tracemalloc a todas las etapas abiertas y reiniciarlo (con el lock tomado).
+
+        Como el pico se reparte antes de cada reinicio, una etapa que abre o
+        cierra otro hilo no borra el pico de las demás.
+        """
+        peak = tracemalloc.get_traced_memory()[1]
+        for token in self._open:
+            token['peak'] = max(token['peak'], peak)
+        tracemalloc.reset_peak()
+
+    def begin(self, name, rows=None):
+        """Abrir una etapa; devuelve un token para end()"""
+        if not self.enabled:
+            return None
+        # process_time suma todos los hilos: en un hilo secundario se mide solo el suyo
+        in_thread = threading.current_thread() is not threading.main_thread()
+        token = {'name': name, 'rows': rows, 'peak': 0, 'profile': None,
+                 'clock': time.thread_time if in_thread else time.process_time}
+        with self._lock:
+            if self.track_memory:
+                self._collect_peak()
+            if self.profile_dir and not self._open:
+                token['profile'] = cProfile.Profile()
+                token['profile'].enable()
+            self._open.append(token)
+        if not self.track_memory:
+            token['rss'] = (current_rss_mb(), _max_rss_mb())
+        token['wall'] = time.perf_counter()
+        token['cpu'] = token['clock']()
+        return token
+
+    def end(self, token, rows=None):
+        """Cerrar una etapa abierta con begin(); rows reemplaza a las filas indicadas al abrirla"""
+        if token is None:
+            return
+        wall = time.perf_counter() - token['wall']
+        cpu = token['clock']() - token['cpu']
+        rss = None if self.track_memory else (current_rss_mb(), _max_rss_mb())
+        if token['profile'] is not None:
+            token['profile'].disable()
+            os.makedirs(self.profile_dir, exist_ok=True)
+            token['profile'].dump_stats(os.path.join(self.profile_dir, f"{token['name']}.prof"))
+
+        with self._lock:
+            if self.track_memory:
+                self._collect_peak()
+            self._open.remove(token)
+            record = self._record(token['name'])
+            record['calls'] += 1
+            record['wall_s'] += wall
+            record['cpu_s'] += cpu
+            rows = token['rows'] if rows is None else rows
+            if rows is not None:
+                record['rows'] = (record['rows'] or 0) + rows
+            if self.track_memory:
+                peak_mb = token['peak'] / 1024 / 1024
+            else:
+                peak_mb = _rss_peak_mb(token['rss'], rss)
+                if token['rss'][0] is not None and rss[0] is not None:
+                    record['rss_delta_mb'] = round((record['rss_delta_mb'] or 0) + rss[0] - token['rss'][0], 2)
+            if peak_mb is not None:
+                record['peak_memory_mb'] = max(record['peak_memory_mb'] or 0, round(peak_mb, 2))
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Medir un bloque: with profiler.stage('load', rows=len(df)): ..."""
+        token = self.begin(name, rows)
+        try:
+            yield token
+        finally:
+            self.end(token)
+
+    def report(self, **metadata):
+        """Informe de la ejecución como diccionario serializable a JSON"""
+        stages = []
+        for record in self.records.values():
+            stage = dict(record, wall_s=round(record['wall_s'], 4), cpu_s=round(record['cpu_s'], 4))
+            if record['rows'] and record['wall_s'] > 0:
+                stage['rows_per_s'] = round(record['rows'] / record['wall_s'], 1)
+            stages.append(stage)
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'total_wall_s': round(time.perf_counter() - self._start, 4),
+            'memory_source': 'tracemalloc' if self.track_memory else 'rss',
+            **metadata,
+            'stages': stages,
+        }
+
+    def write_report(self, report_dir, **metadata):
+        """Guardar el informe en report_dir/run_<fecha>.json y devolver la ruta"""
+        if not self.enabled or not report_dir:
+            return None
+        os.makedirs(report_dir, exist_ok=True)
+        path = os.path.join(report_dir, f"run_{self.started_at:%Y%m%d_%H%M%S}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(**metadata), f, indent=2, default=str)
+        return path
+
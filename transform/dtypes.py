@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from transform.normalize import arrow_string_dtype
+
+# Categorías fijas: todos los lotes comparten el mismo dtype y pueden concatenarse sin volver a object
+DAY_OF_WEEK_DTYPE = pd.CategoricalDtype(
+    ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'], ordered=True)
+SENTIMENT_DTYPE = pd.CategoricalDtype(['Negativo', 'Positivo'])
+CATEGORICAL_COLUMNS = {'DayOfWeek': DAY_OF_WEEK_DTYPE, 'Sentiment': SENTIMENT_DTYPE}
+
+# Enteros con rango conocido; el resto de columnas enteras se reducen según sus valores
+INTEGER_COLUMNS = {'Year': 'int16', 'Month': 'int8', 'Day': 'int8', 'Label': 'int8'}
+
+
+def _smallest_integer(series, dtype=None):
+    """Entero más pequeño que contiene los valores; nullable (Int8...) si hay nulos"""
+    if dtype is None:
+        dtype = pd.to_numeric(series.dropna(), downcast='integer').dtype.name if series.notna().any() else 'int8'
+    if series.isna().any():
+        return series.astype(dtype.capitalize())
+    return series.astype(dtype)
+
+
+def compact_dtypes(df, keyword_columns=(), use_arrow_strings=True):
+    """Representación compacta del DataFrame transformado.
+
+    DayOfWeek y Sentiment pasan a categóricas, Year/Month/Day/Label y los
+    conteos (ValidTitles y palabras clave) al entero más pequeño que los
+    contiene, y las columnas de texto a string[pyarrow] si está disponible.
+    Los valores no cambian: solo su representación en memoria.
+    """
+    df = df.copy(deep=False)
+    for col, dtype in CATEGORICAL_COLUMNS.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+
+    for col in list(INTEGER_COLUMNS) + ['ValidTitles'] + list(keyword_columns):
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
+            values = df[col]
+            # Enteros guardados como float (por NaN previos): solo si no pierden decimales
+            if pd.api.types.is_float_dtype(values) and not (values.dropna() % 1 == 0).all():
+                continue
+            df[col] = _smallest_integer(values, INTEGER_COLUMNS.get(col))
+
+    string_dtype = arrow_string_dtype() if use_arrow_strings else None
+    if string_dtype is not None:
+        text_columns = [col for col in df.columns
+                        if (col.startswith('Top') or col == 'AllTitles') and df[col].dtype == object]
+        for col in text_columns:
+            df[col] = df[col].astype(string_dtype)
+    return df
+
+
+def column_memory(df):
+    """Dtype y memoria (MB, deep=True) de cada columna"""
+    return pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'mb': df.memory_usage(index=False, deep=True) / 1024 ** 2,
+    })
+
+
+def memory_report(before, after):
+    """Memoria por columna antes y después de compactar, de mayor a menor ahorro.
+
+    before y after son resultados de column_memory(). before debe medirse
+    antes de convertir: al pasar texto no ASCII a pyarrow, CPython guarda una
+    copia UTF-8 en cada str original y su tamaño aparente se duplica.
+    """
+    after = after.reindex(before.index)
+    report = pd.DataFrame({
+        'dtype_before': before['dtype'],
+        'mb_before': before['mb'],
+        'dtype_after': after['dtype'].fillna('-'),
+        'mb_after': after['mb'].fillna(0.0),
+    })
+    report['saved_mb'] = report['mb_before'] - report['mb_after']
+    return report.sort_values('saved_mb', ascending=False)
+
+
+def print_memory_report(report):
+    """Imprimir el total y cada columna, con Top1-Top25 agrupadas en una línea"""
+    total_before, total_after = report['mb_before'].sum(), report['mb_after'].sum()
+    ratio = total_after / total_before if total_before else np.nan
+    print(f"🧮 Memoria del DataFrame: {total_before:.1f} MB -> {total_after:.1f} MB ({ratio:.0%})")
+    is_news = report.index.str.match(r'Top\d+$')
+    rows = list(report[~is_news].iterrows())
+    if is_news.any():
+        news = report[is_news]
+        rows.append((f"Top1-Top{is_news.sum()}", {
+            'dtype_before': news['dtype_before'].iloc[0], 'mb_before': news['mb_before'].sum(),
+            'dtype_after': news['dtype_after'].iloc[0], 'mb_after': news['mb_after'].sum(),
+        }))
+    for col, row in sorted(rows, key=lambda item: item[1]['mb_after'] - item[1]['mb_before']):
+        print(f"   - {col:<18} {row['dtype_before']:>16} {row['mb_before']:8.2f} MB -> "
+              f"{row['dtype_after']:>16} {row['mb_after']:8.2f} MB")
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+
+def _join_rows(present, n_rows):
+    """Unir con un solo ' '.join por fila, recorriendo las columnas como listas (None = sin título)"""
+    columns = [present[:, j].tolist() for j in range(present.shape[1])]
+    if not columns:
+        return [''] * n_rows
+    return [' '.join([title for title in row if title is not None]) for row in zip(*columns)]
+
+
+def join_titles(df, news_columns=None):
+    """Reconstruir AllTitles a partir de las columnas de noticias ya limpias.
+
+    Permite no guardar AllTitles en el DataFrame transformado (LAZY_ALL_TITLES)
+    y generarlo solo donde hace falta, por ejemplo al cargar la base de datos.
+    """
+    if news_columns is None:
+        news_columns = [col for col in df.columns if col.startswith('Top')]
+    values = df[news_columns].to_numpy(dtype=object, na_value=None)
+    all_titles = _join_rows(values, len(df))
+    return pd.Series(all_titles, index=df.index, dtype=object, name='AllTitles')
+
+
+def title_features(df, news_columns):
+    """Calcular las métricas derivadas de los títulos por columnas, sin apply fila a fila.
+
+    Espera columnas de noticias ya limpias (str o NaN). Devuelve un DataFrame con
+    ValidTitles, AllTitles y AvgTitleLength, y otro con la longitud de cada
+    columna (NaN donde no hay título).
+    """
+    values = df[news_columns].to_numpy(dtype=object)
+    mask = df[news_columns].notna().to_numpy(dtype=bool)
+
+    # Longitudes por columna: len() solo sobre las celdas con título
+    titles = values[mask]
+    lengths = np.full(values.shape, np.nan)
+    lengths[mask] = np.fromiter(map(len, titles), dtype=np.int64, count=len(titles))
+
+    valid_titles = mask.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_title_length = np.where(mask, lengths, 0.0).sum(axis=1) / valid_titles
+
+    all_titles = _join_rows(np.where(mask, values, None), len(df))
+
+    features = pd.DataFrame({
+        'ValidTitles': valid_titles.astype(np.int64),
+        'AllTitles': pd.Series(all_titles, index=df.index, dtype=object),
+        'AvgTitleLength': avg_title_length,
+    }, index=df.index)
+    column_lengths = pd.DataFrame(lengths, index=df.index, columns=news_columns)
+    return features, column_lengths
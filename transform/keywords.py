@@ -0,0 +1,103 @@
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+# Léxicos por defecto: nombre de la columna de salida -> palabras clave
+DEFAULT_LEXICONS = {
+    # Palabras relacionadas con mercados financieros
+    'FinancialKeywords': ['stock', 'market', 'trading', 'price', 'earnings', 'revenue',
+                          'profit', 'loss', 'investor', 'investment', 'bank', 'economy'],
+    # Palabras relacionadas con sentimientos positivos
+    'PositiveKeywords': ['rise', 'gain', 'up', 'increase', 'growth', 'profit', 'success',
+                         'boost', 'surge', 'rally', 'positive', 'strong', 'better'],
+    # Palabras relacionadas con sentimientos negativos
+    'NegativeKeywords': ['fall', 'drop', 'down', 'decrease', 'loss', 'decline', 'crisis',
+                         'crash', 'plunge', 'negative', 'weak', 'worse', 'trouble'],
+}
+
+
+def load_lexicons(path=None):
+    """Leer los léxicos desde un JSON {"Columna": ["palabra", ...]} o usar los de por defecto"""
+    if not path:
+        return DEFAULT_LEXICONS
+    with open(path, 'r', encoding='utf-8') as f:
+        lexicons = json.load(f)
+    if not isinstance(lexicons, dict) or not all(isinstance(words, list) for words in lexicons.values()):
+        raise ValueError(f"Formato de léxicos inválido en {path}: se esperaba {{columna: [palabras]}}")
+    return lexicons
+
+
+def _trie_pattern(words):
+    """Construir una alternancia en forma de trie ("s(?:tock|urge)") que el motor de re recorre más rápido"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Si una palabra termina aquí, el resto es opcional (el cuantificador es codicioso)
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Cuenta palabras clave de varios léxicos con una sola expresión regular compilada.
+
+    Con whole_word=True cada palabra del texto se compara completa ("up" no
+    cuenta dentro de "support") y todos los léxicos se cuentan en una sola
+    pasada. Con whole_word=False se reproduce el conteo por subcadenas
+    anterior, que requiere una pasada por léxico porque las coincidencias
+    de distintos léxicos pueden solaparse ("rise" dentro de "price").
+    """
+
+    def __init__(self, lexicons=None, whole_word=True):
+        self.lexicons = {name: [word.lower() for word in words]
+                         for name, words in (lexicons or DEFAULT_LEXICONS).items()}
+        self.whole_word = whole_word
+
+        keywords = sorted({word for words in self.lexicons.values() for word in words},
+                          key=lambda word: (-len(word), word))
+        self.pattern = None
+        self.patterns = {}
+        if whole_word:
+            self.pattern = re.compile(rf'(?<!\w)(?:{_trie_pattern(keywords)})(?!\w)')
+        else:
+            self.patterns = {name: re.compile('|'.join(re.escape(word) for word in words))
+                             for name, words in self.lexicons.items()}
+
+        # Matriz palabra -> léxicos a los que pertenece (una palabra puede estar en varios)
+        self.codes = {word: i for i, word in enumerate(keywords)}
+        self.membership = np.array(
+            [[int(word in words) for words in self.lexicons.values()] for word in keywords],
+            dtype=np.int64,
+        ).reshape(len(keywords), len(self.lexicons))
+
+    def count(self, texts):
+        """Devolver un DataFrame con una columna de conteos por léxico, alineado con texts"""
+        lowered = texts.fillna('').str.lower()
+        if not self.whole_word:
+            return pd.DataFrame({name: lowered.str.count(pattern)
+                                 for name, pattern in self.patterns.items()}, index=texts.index)
+
+        # Una sola pasada por fila: todas las coincidencias, luego se reparten por léxico
+        findall = self.pattern.findall
+        matches = [findall(text) for text in lowered.tolist()]
+        lengths = np.fromiter(map(len, matches), dtype=np.int64, count=len(matches))
+        codes = np.fromiter((self.codes[word] for row in matches for word in row),
+                            dtype=np.int64, count=int(lengths.sum()))
+        rows = np.repeat(np.arange(len(matches)), lengths)
+
+        counts = {}
+        for j, name in enumerate(self.lexicons):
+            counts[name] = np.bincount(rows, weights=self.membership[codes, j],
+                                       minlength=len(matches)).astype(np.int64)
+        return pd.DataFrame(counts, index=texts.index)
@@ -0,0 +1,65 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Tramos de caracteres permitidos en un título; todo lo demás (incluidos espacios) los separa
+_ALLOWED_RUNS = re.compile(r'[\w.,;:!?\'"()-]+')
+_MISSING_VALUES = frozenset(['', 'nan', 'NaN'])
+
+
+def _normalize_title(value):
+    text = str(value).strip()
+    if text in _MISSING_VALUES:
+        return np.nan
+    # Equivale a reemplazar los caracteres especiales por ' ', colapsar espacios y hacer strip
+    return ' '.join(_ALLOWED_RUNS.findall(text))
+
+
+def arrow_string_dtype():
+    """Dtype de texto respaldado por pyarrow, o None si pyarrow no está instalado"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    return pd.StringDtype('pyarrow')
+
+
+def _interned_titles(values):
+    """Limpiar cada título distinto una sola vez; las celdas repetidas comparten el mismo objeto str"""
+    # Tabla hash sobre los valores crudos: los faltantes quedan con código -1
+    codes, uniques = pd.factorize(values)
+    cleaned = [_normalize_title(value) for value in uniques]
+    # Textos crudos distintos pueden quedar iguales al limpiarlos (espacios, símbolos): segunda deduplicación
+    clean_codes, clean_uniques = pd.factorize(np.array(cleaned, dtype=object))
+    codes = np.where(codes >= 0, clean_codes.take(codes), -1)
+    interned = np.asarray(clean_uniques, dtype=object).take(np.maximum(codes, 0))
+    interned[codes < 0] = np.nan
+    return interned
+
+
+def normalize_news_columns(df, news_columns, use_arrow_strings=False, intern=False):
+    """Limpiar todas las columnas de noticias en una sola pasada sobre los valores apilados.
+
+    Produce el mismo texto que la limpieza columna a columna (strip, vacíos y
+    'nan' a NaN, caracteres especiales a espacio, espacios múltiples a uno),
+    pero recorre cada celda una sola vez en lugar de seis pasadas por columna.
+    Con intern=True cada título distinto se limpia una vez y sus repeticiones
+    (en otros días o columnas) apuntan al mismo objeto en memoria. Con
+    use_arrow_strings=True y pyarrow disponible, las columnas resultantes
+    usan el dtype string[pyarrow].
+    """
+    values = df[news_columns].to_numpy(dtype=object, na_value=np.nan)
+    if intern:
+        cleaned = _interned_titles(values.ravel())
+    else:
+        cleaned = np.array([_normalize_title(value) for value in values.ravel()], dtype=object)
+    normalized = pd.DataFrame(cleaned.reshape(values.shape), index=df.index, columns=news_columns)
+
+    if use_arrow_strings:
+        dtype = arrow_string_dtype()
+        if dtype is None:
+            print("⚠️ pyarrow no está instalado; se mantienen las columnas de texto como object")
+        else:
+            normalized = normalized.astype(dtype)
+    return normalized
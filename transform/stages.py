@@ -0,0 +1,148 @@
+import pandas as pd
+
+from transform.features import title_features
+from transform.normalize import normalize_news_columns
+
+# Marcadores de grupos de columnas en las entradas y salidas declaradas:
+# las columnas de noticias (Top1-Top25) y las de los léxicos de palabras clave
+NEWS = 'Top*'
+KEYWORDS = 'Keywords*'
+
+
+class Stage:
+    """Etapa de Transform.clean con columnas de entrada y salida declaradas.
+
+    func recibe un dict {columna: Series} con al menos las entradas y el
+    contexto de la transformación, y devuelve un dict con las columnas que
+    produce. Las etapas de fase 'keys' se ejecutan sobre todas las filas,
+    antes de descartar duplicados y faltantes; las de fase 'rows' solo sobre
+    las filas conservadas y no dependen de otras filas, por lo que pueden
+    repartirse por particiones entre procesos.
+    """
+
+    def __init__(self, name, func, inputs, outputs, phase='rows'):
+        if phase not in ('keys', 'rows'):
+            raise ValueError(f"Fase desconocida para la etapa {name}: {phase} (use 'keys' o 'rows')")
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.phase = phase
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, {self.inputs} -> {self.outputs}, phase={self.phase!r})"
+
+    def resolve(self, columns, context):
+        """Expandir NEWS y KEYWORDS a los nombres reales de columnas"""
+        groups = {NEWS: context['news_columns'], KEYWORDS: context['keyword_columns']}
+        resolved = []
+        for col in columns:
+            resolved.extend(groups.get(col, [col]))
+        return resolved
+
+    def run(self, data, context):
+        return self.func(data, context)
+
+
+# Registro de etapas en orden de ejecución: cada etapa debe registrarse después de las que producen sus entradas
+STAGES = {}
+
+
+def register_stage(name, inputs, outputs, phase='rows'):
+    """Decorador que registra una función como etapa de Transform.clean"""
+    def decorator(func):
+        STAGES[name] = Stage(name, func, inputs, outputs, phase)
+        return func
+    return decorator
+
+
+@register_stage('fechas', inputs=['Date'], outputs=['Date', 'Year', 'Month', 'Day', 'DayOfWeek'], phase='keys')
+def parse_dates(data, context):
+    dates = pd.to_datetime(data['Date'], errors='coerce')
+    context['log'](f"📅 Fechas procesadas: {dates.min()} a {dates.max()}")
+    return {'Date': dates, 'Year': dates.dt.year, 'Month': dates.dt.month,
+            'Day': dates.dt.day, 'DayOfWeek': dates.dt.day_name()}
+
+
+@register_stage('etiquetas', inputs=['Label'], outputs=['Label', 'Sentiment'], phase='keys')
+def parse_labels(data, context):
+    # Asegurar que Label sea binario (0 o 1) y crear la columna de sentimiento textual
+    labels = pd.to_numeric(data['Label'], errors='coerce').astype('Int64')
+    sentiment = labels.map({0: 'Negativo', 1: 'Positivo'})
+    context['log'](f"🎭 Sentimientos procesados: {sentiment.value_counts().to_dict()}")
+    return {'Label': labels, 'Sentiment': sentiment}
+
+
+@register_stage('titulos', inputs=[NEWS], outputs=[NEWS])
+def clean_titles(data, context):
+    news_columns = context['news_columns']
+    if not news_columns:
+        return {}
+    news = pd.DataFrame({col: data[col] for col in news_columns}, copy=False)
+    normalized = normalize_news_columns(news, news_columns, use_arrow_strings=context['use_arrow_strings'],
+                                        intern=context['intern_headlines'])
+    return dict(normalized.items())
+
+
+@register_stage('metricas_titulos', inputs=[NEWS], outputs=['ValidTitles', 'AvgTitleLength', 'AllTitles'])
+def derive_title_metrics(data, context):
+    # Títulos válidos por día, texto combinado y longitud promedio (cálculo por columnas)
+    news_columns = context['news_columns']
+    index = data[news_columns[0]].index if news_columns else context['index']
+    news = pd.DataFrame({col: data[col] for col in news_columns}, index=index, copy=False)
+    features, _ = title_features(news, news_columns)
+    return dict(features.items())
+
+
+@register_stage('palabras_clave', inputs=['AllTitles'], outputs=[KEYWORDS])
+def count_keywords(data, context):
+    # Financieras, positivas y negativas contadas en una sola pasada por fila
+    return dict(context['keyword_matcher'].count(data['AllTitles']).items())
+
+
+def plan_stages(requested, context, stages=None):
+    """Etapas necesarias para producir las columnas pedidas (None = todas), en orden de registro.
+
+    Las etapas de fase 'keys' siempre se incluyen: el filtrado de duplicados
+    y faltantes necesita Date y Label ya convertidos.
+    """
+    stages = list((stages or STAGES).values())
+    if requested is None:
+        return stages
+    needed = set(requested)
+    selected = []
+    for stage in reversed(stages):
+        outputs = stage.resolve(stage.outputs, context)
+        if stage.phase == 'keys' or needed.intersection(outputs):
+            selected.append(stage)
+            needed.update(stage.resolve(stage.inputs, context))
+    return selected[::-1]
+
+
+def stage_waves(stages, context):
+    """Agrupar las etapas en tandas: las de una misma tanda no dependen entre sí"""
+    producers, levels = {}, {}
+    for stage in stages:
+        depends_on = {producers[col] for col in stage.resolve(stage.inputs, context) if col in producers}
+        levels[stage.name] = 1 + max((levels[name] for name in depends_on), default=-1)
+        for col in stage.resolve(stage.outputs, context):
+            producers[col] = stage.name
+    waves = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+    for stage in stages:
+        waves[levels[stage.name]].append(stage)
+    return waves
+
+
+def run_row_stages(frame, stages, context):
+    """Ejecutar en orden etapas de fase 'rows' sobre una partición; devuelve sus salidas como DataFrame.
+
+    Función de módulo para poder enviarla a otro proceso con ProcessPoolExecutor.
+    """
+    data = dict(frame.items())
+    outputs = {}
+    context = dict(context, index=frame.index)
+    for stage in stages:
+        produced = stage.run(data, context)
+        data.update(produced)
+        outputs.update(produced)
+    return pd.DataFrame(outputs, index=frame.index, copy=False)
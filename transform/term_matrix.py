@@ -0,0 +1,235 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from transform.features import join_titles
+
+# Palabras de dos o más caracteres alfanuméricos, sobre el texto en minúsculas (\w+ es codicioso:
+# nunca empieza a mitad de una palabra)
+TOKEN_PATTERN = re.compile(r'\w\w+')
+# Un lote se tokeniza con una sola búsqueda sobre sus textos unidos por ROW_SEPARATOR (separador de registro ASCII)
+ROW_SEPARATOR = '\x1e'
+_BLOCK_PATTERN = re.compile(TOKEN_PATTERN.pattern + '|' + ROW_SEPARATOR)
+
+# Archivo: MAGIC, longitud del encabezado JSON (uint64) y los arreglos alineados a ALIGNMENT bytes
+MAGIC = b'TERMMAT1'
+ALIGNMENT = 64
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class TermMatrixBuilder:
+    """Construye la matriz dispersa documento-término (CSR) de los titulares en una sola pasada por lotes.
+
+    Cada fila es un día (AllTitles, o Top1-Top25 unidos si no está) y se
+    guarda con su Date y Label. Con n_features=None se arma el vocabulario
+    completo; con un entero se usa hashing trick: la columna de cada término
+    es su hash módulo n_features, sin vocabulario en memoria (los términos que
+    colisionan suman sus conteos). Los índices y conteos de cada lote se
+    escriben a archivos temporales, así que la memoria queda acotada por el
+    lote y el vocabulario; finish() calcula el TF-IDF y arma el archivo final.
+    """
+
+    def __init__(self, path, n_features=None, block_rows=5000):
+        self.path = path
+        self.n_features = n_features
+        self.block_rows = block_rows
+        self.vocabulary = {} if n_features is None else None
+        self.document_frequency = np.zeros(n_features or 0, dtype=np.int64)
+        self.rows = 0
+        self.nnz = 0
+        output_dir = os.path.dirname(path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        self._spill_dir = tempfile.mkdtemp(prefix='term_matrix_', dir=output_dir or '.')
+        self._spill = {name: open(os.path.join(self._spill_dir, name), 'wb')
+                       for name in ('indices', 'counts', 'row_nnz', 'dates', 'labels')}
+
+    def _columns(self, uniques):
+        """Columna de cada término distinto del lote"""
+        if self.vocabulary is None:
+            return (pd.util.hash_array(uniques) % np.uint64(self.n_features)).astype(np.int64)
+        vocabulary = self.vocabulary
+        # setdefault asigna la siguiente columna solo a los términos nuevos
+        return np.fromiter((vocabulary.setdefault(term, len(vocabulary)) for term in uniques),
+                           dtype=np.int64, count=len(uniques))
+
+    def _add_block(self, texts, dates, labels):
+        texts = [text if isinstance(text, str) else '' for text in texts]
+        joined = ROW_SEPARATOR.join(texts)
+        if joined.count(ROW_SEPARATOR) != len(texts) - 1:
+            joined = ROW_SEPARATOR.join(text.replace(ROW_SEPARATOR, ' ') for text in texts)
+        tokens = np.array(_BLOCK_PATTERN.findall(joined.lower()), dtype=object)
+        codes, uniques = pd.factorize(tokens)
+
+        # Fila de cada término: separadores vistos antes que él
+        is_term = np.ones(len(uniques), dtype=bool)
+        is_term[uniques == ROW_SEPARATOR] = False
+        separators = ~is_term[codes]
+        rows = np.cumsum(separators)[~separators]
+        term_columns = np.full(len(uniques), -1, dtype=np.int64)
+        term_columns[is_term] = self._columns(uniques[is_term])
+        columns = term_columns[codes[~separators]]
+
+        # Conteo por (fila, columna): una clave de 64 bits ordenada deja las filas en orden CSR
+        keys, counts = np.unique((rows << 32) | columns, return_counts=True)
+        doc_rows, doc_columns = keys >> 32, keys & 0xFFFFFFFF
+
+        n_columns = self.n_features or len(self.vocabulary)
+        if len(self.document_frequency) < n_columns:
+            self.document_frequency = np.concatenate(
+                [self.document_frequency, np.zeros(n_columns - len(self.document_frequency), dtype=np.int64)])
+        self.document_frequency += np.bincount(doc_columns, minlength=n_columns)
+
+        doc_columns.astype(np.int64).tofile(self._spill['indices'])
+        counts.astype(np.int32).tofile(self._spill['counts'])
+        np.bincount(doc_rows, minlength=len(texts)).astype(np.int64).tofile(self._spill['row_nnz'])
+        dates.tofile(self._spill['dates'])
+        labels.tofile(self._spill['labels'])
+        self.rows += len(texts)
+        self.nnz += len(keys)
+
+    def add_frame(self, df):
+        """Agregar las filas de un DataFrame transformado (o de un lote del CSV limpio)"""
+        texts = df['AllTitles'] if 'AllTitles' in df.columns else join_titles(df)
+        dates = pd.to_datetime(df['Date']).to_numpy('datetime64[ns]')
+        labels = pd.to_numeric(df['Label']).fillna(-1).to_numpy(np.int8)
+        texts = texts.tolist()
+        for start in range(0, len(texts), self.block_rows):
+            end = start + self.block_rows
+            self._add_block(texts[start:end], dates[start:end], labels[start:end])
+        return self
+
+    def finish(self):
+        """Calcular IDF y TF-IDF (normalizado L2 por fila) y escribir el archivo final; devuelve su ruta"""
+        for spill in self._spill.values():
+            spill.close()
+        spilled = {name: np.memmap(os.path.join(self._spill_dir, name), dtype=dtype, mode='r')
+                   if os.path.getsize(os.path.join(self._spill_dir, name)) else np.empty(0, dtype=dtype)
+                   for name, dtype in [('indices', np.int64), ('counts', np.int32), ('row_nnz', np.int64),
+                                       ('dates', 'datetime64[ns]'), ('labels', np.int8)]}
+
+        n_columns = self.n_features or len(self.vocabulary)
+        # int32 mientras alcance: scipy.sparse usa los arreglos sin convertirlos
+        index_dtype = np.int32 if max(self.nnz, n_columns) < 2 ** 31 else np.int64
+        indptr = np.zeros(self.rows + 1, dtype=index_dtype)
+        np.cumsum(spilled['row_nnz'], out=indptr[1:])
+        # IDF suavizado, como TfidfTransformer de scikit-learn: ln((1 + n) / (1 + df)) + 1
+        idf = (np.log((1 + self.rows) / (1 + self.document_frequency[:n_columns])) + 1).astype(np.float32)
+
+        arrays = [('indptr', index_dtype, self.rows + 1), ('indices', index_dtype, self.nnz),
+                  ('counts', np.int32, self.nnz), ('tfidf', np.float32, self.nnz),
+                  ('idf', np.float32, n_columns), ('dates', 'datetime64[ns]', self.rows),
+                  ('labels', np.int8, self.rows)]
+        layout, offset = {}, 0
+        for name, dtype, size in arrays:
+            layout[name] = {'dtype': np.dtype(dtype).str, 'shape': [size], 'offset': offset}
+            offset = _aligned(offset + np.dtype(dtype).itemsize * size)
+        header = json.dumps({
+            'rows': self.rows, 'columns': n_columns, 'nnz': self.nnz,
+            'hashing': self.vocabulary is None, 'token_pattern': TOKEN_PATTERN.pattern,
+            'vocabulary': list(self.vocabulary) if self.vocabulary is not None else None,
+            'arrays': layout,
+        }).encode('utf-8')
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC + np.uint64(len(header)).tobytes() + header)
+            data_start = _aligned(f.tell())
+            f.truncate(data_start + offset)
+
+        target = {name: np.memmap(tmp_path, dtype=spec['dtype'], mode='r+', offset=data_start + spec['offset'],
+                                  shape=tuple(spec['shape']))
+                  for name, spec in layout.items() if spec['shape'][0]}
+        if 'indptr' in target:
+            target['indptr'][:] = indptr
+        for name in ('dates', 'labels'):
+            if name in target:
+                target[name][:] = spilled[name]
+        if 'idf' in target:
+            target['idf'][:] = idf
+        # Índices, conteos y TF-IDF por bloques de filas para no cargar la matriz completa
+        for start in range(0, self.rows, self.block_rows):
+            end = min(start + self.block_rows, self.rows)
+            lo, hi = int(indptr[start]), int(indptr[end])
+            if lo == hi:
+                continue
+            columns = spilled['indices'][lo:hi]
+            counts = spilled['counts'][lo:hi]
+            weights = counts * idf[columns]
+            rows = np.repeat(np.arange(end - start), np.diff(indptr[start:end + 1]))
+            norms = np.sqrt(np.bincount(rows, weights=weights.astype(np.float64) ** 2, minlength=end - start))
+            target['indices'][lo:hi] = columns
+            target['counts'][lo:hi] = counts
+            target['tfidf'][lo:hi] = weights / norms[rows]
+        for array in target.values():
+            array.flush()
+        del target, spilled
+        os.replace(tmp_path, self.path)
+        self.close()
+        return self.path
+
+    def close(self):
+        """Borrar los archivos temporales (también si la construcción se interrumpe)"""
+        for spill in self._spill.values():
+            spill.close()
+        shutil.rmtree(self._spill_dir, ignore_errors=True)
+
+
+class TermMatrix:
+    """Matriz documento-término leída de un archivo de TermMatrixBuilder, mapeada en memoria.
+
+    indptr, indices, counts y tfidf son los arreglos CSR (filas = días),
+    dates y labels están alineados con las filas e idf con las columnas.
+    Los arreglos son np.memmap de solo lectura: abrir el archivo no lee la
+    matriz, solo las páginas que se usan.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} no es un archivo de matriz documento-término")
+            header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            self.header = json.loads(f.read(header_length))
+            data_start = _aligned(f.tell())
+        self.path = path
+        self.shape = (self.header['rows'], self.header['columns'])
+        self.hashing = self.header['hashing']
+        self.vocabulary = self.header['vocabulary']
+        self._columns = None
+        for name, spec in self.header['arrays'].items():
+            shape = tuple(spec['shape'])
+            array = np.memmap(path, dtype=spec['dtype'], mode='r', offset=data_start + spec['offset'],
+                              shape=shape) if shape[0] else np.empty(shape, dtype=spec['dtype'])
+            setattr(self, name, array)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def column(self, term):
+        """Columna de un término (None si no está en el vocabulario)"""
+        term = term.lower()
+        if self.hashing:
+            return int(pd.util.hash_array(np.array([term], dtype=object))[0] % np.uint64(self.shape[1]))
+        if self._columns is None:
+            self._columns = {word: i for i, word in enumerate(self.vocabulary)}
+        return self._columns.get(term)
+
+    def to_scipy(self, values='tfidf'):
+        """scipy.sparse.csr_matrix con los valores 'tfidf' o 'counts', sin copiar los arreglos"""
+        if values not in ('tfidf', 'counts'):
+            raise ValueError(f"Valores desconocidos: {values} (use 'tfidf' o 'counts')")
+        from scipy.sparse import csr_matrix
+        return csr_matrix((getattr(self, values), self.indices, self.indptr), shape=self.shape, copy=False)
+
+
+def load_term_matrix(path):
+    """Abrir un archivo de matriz documento-término mapeado en memoria"""
+    return TermMatrix(path)
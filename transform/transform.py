@@ -1,120 +1,232 @@
-
 import pandas as pd
 import numpy as np
-import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 
-class Transform:
-    def __init__(self, df):
-        self.df = df
+from config.settings import Settings
+from monitoring.profiler import StageProfiler
+from transform.dtypes import column_memory, compact_dtypes, memory_report, print_memory_report
+from transform.keywords import KeywordMatcher, load_lexicons
+from transform.stages import STAGES, plan_stages, run_row_stages, stage_waves
 
-    def clean(self):
-        df = self.df.copy()
-        print("🧹 Iniciando transformación de datos de análisis de sentimiento...")
+# Orden de las columnas en el resultado; las demás de entrada y las de etapas propias van al final
+PREFERRED_ORDER = [
+    'Date', 'Year', 'Month', 'Day', 'DayOfWeek', 'Label', 'Sentiment',
+    'ValidTitles', 'AvgTitleLength', 'FinancialKeywords', 'PositiveKeywords', 'NegativeKeywords'
+]
 
-        initial_count = len(df)
-        
-        # 1. Limpieza de fechas
-        if 'Date' in df.columns:
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-            df['Year'] = df['Date'].dt.year
-            df['Month'] = df['Date'].dt.month
-            df['Day'] = df['Date'].dt.day
-            df['DayOfWeek'] = df['Date'].dt.day_name()
-            print(f"📅 Fechas procesadas: {df['Date'].min()} a {df['Date'].max()}")
-
-        # 2. Limpieza de etiquetas de sentimiento
-        if 'Label' in df.columns:
-            # Asegurar que Label sea binario (0 o 1)
-            df['Label'] = pd.to_numeric(df['Label'], errors='coerce')
-            df['Label'] = df['Label'].astype('Int64')
-            
-            # Crear columna de sentimiento textual
-            df['Sentiment'] = df['Label'].map({0: 'Negativo', 1: 'Positivo'})
-            print(f"🎭 Sentimientos procesados: {df['Sentiment'].value_counts().to_dict()}")
-
-        # 3. Limpieza de títulos de noticias (Top1-Top25)
-        news_columns = [col for col in df.columns if col.startswith('Top')]
-        print(f"📰 Procesando {len(news_columns)} columnas de noticias...")
-        
-        for col in news_columns:
-            if col in df.columns:
-                # Limpiar espacios y caracteres especiales
-                df[col] = df[col].astype(str).str.strip()
-                # Reemplazar valores vacíos o 'nan' con None
-                df[col] = df[col].replace(['', 'nan', 'NaN'], np.nan)
-                
-                # Limpiar caracteres especiales pero mantener contenido
-                df[col] = df[col].str.replace(r'[^\w\s\.,;:!?\'"()-]', ' ', regex=True)
-                df[col] = df[col].str.replace(r'\s+', ' ', regex=True)  # Múltiples espacios a uno
-                df[col] = df[col].str.strip()
-
-        # 4. Crear columnas derivadas útiles para análisis
-        # Contar títulos válidos por día
-        df['ValidTitles'] = df[news_columns].notna().sum(axis=1)
-        
-        # Crear texto combinado de todos los títulos
-        df['AllTitles'] = df[news_columns].apply(
-            lambda row: ' '.join([str(val) for val in row if pd.notna(val)]), axis=1
-        )
-        
-        # Longitud promedio de títulos
-        df['AvgTitleLength'] = df[news_columns].apply(
-            lambda row: np.mean([len(str(val)) for val in row if pd.notna(val)]), axis=1
+
+class SeenKeys:
+    """Claves (Date, Label) ya vistas en lotes anteriores del modo streaming.
+
+    Se guardan como un arreglo int64 ordenado, date_ns * 2 + label (8 bytes
+    por clave, en vez de ~220 bytes de una tupla en un set), y se buscan con
+    searchsorted. La memoria sigue siendo O(claves distintas): 10M días
+    ocupan ~80 MB. Las etiquetas fuera de 0/1, que el dataset no usa, van a
+    un set aparte para no perder exactitud.
+    """
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.other = set()
+
+    def __len__(self):
+        return len(self.keys) + len(self.other)
+
+    def add_new(self, dates, labels):
+        """Registrar las claves (sin repetidos entre sí) y devolver la máscara de las que no se habían visto"""
+        date_ns = pd.to_datetime(dates).to_numpy('datetime64[ns]').view(np.int64)
+        labels = np.asarray(labels, dtype=np.int64)
+        binary = (labels == 0) | (labels == 1)
+        is_new = np.ones(len(labels), dtype=bool)
+
+        keys = date_ns[binary] * 2 + labels[binary]
+        positions = np.searchsorted(self.keys, keys)
+        found = positions < len(self.keys)
+        found[found] = self.keys[positions[found]] == keys[found]
+        is_new[binary] = ~found
+        # Dos tramos ya ordenados: el ordenamiento estable (timsort) los une en tiempo lineal
+        self.keys = np.sort(np.concatenate([self.keys, keys[~found]]), kind='stable')
+
+        for i in np.flatnonzero(~binary):
+            key = (int(date_ns[i]), int(labels[i]))
+            is_new[i] = key not in self.other
+            self.other.add(key)
+        return is_new
+
+
+class Transform:
+    def __init__(self, df=None, profiler=None):
+        self.df = df
+        self.rows_transformed = 0
+        # Memoria por columna antes y después de compactar (solo con COMPACT_DTYPES)
+        self.memory_report = None
+        self.config = Settings()
+        # Sin profiler las mediciones de las etapas de clean() no hacen nada
+        self.profiler = profiler or StageProfiler(enabled=False)
+        self._executor = None
+        self.keyword_matcher = KeywordMatcher(
+            load_lexicons(self.config.KEYWORD_LEXICONS_PATH),
+            whole_word=self.config.KEYWORD_WHOLE_WORD,
         )
 
-        # 5. Detectar y eliminar duplicados
-        initial_count = len(df)
-        df = df.drop_duplicates(subset=['Date', 'Label'])
-        duplicates_removed = initial_count - len(df)
-        if duplicates_removed > 0:
-            print(f"🔄 Duplicados eliminados: {duplicates_removed}")
-
-        # 6. Eliminar filas con datos críticos faltantes
-        initial_count = len(df)
-        df = df.dropna(subset=['Date', 'Label'])
-        missing_data_removed = initial_count - len(df)
-        if missing_data_removed > 0:
-            print(f"❌ Filas eliminadas por datos faltantes: {missing_data_removed}")
-
-        # 7. Análisis de palabras clave en títulos (para análisis adicional)
-        # Palabras relacionadas con mercados financieros
-        financial_keywords = ['stock', 'market', 'trading', 'price', 'earnings', 'revenue', 
-                            'profit', 'loss', 'investor', 'investment', 'bank', 'economy']
-        
-        # Palabras relacionadas con sentimientos positivos
-        positive_keywords = ['rise', 'gain', 'up', 'increase', 'growth', 'profit', 'success', 
-                           'boost', 'surge', 'rally', 'positive', 'strong', 'better']
-        
-        # Palabras relacionadas con sentimientos negativos  
-        negative_keywords = ['fall', 'drop', 'down', 'decrease', 'loss', 'decline', 'crisis',
-                           'crash', 'plunge', 'negative', 'weak', 'worse', 'trouble']
-
-        for keyword_list, col_name in [(financial_keywords, 'FinancialKeywords'), 
-                                      (positive_keywords, 'PositiveKeywords'),
-                                      (negative_keywords, 'NegativeKeywords')]:
-            df[col_name] = df['AllTitles'].str.lower().str.count(
-                '|'.join(keyword_list)
-            )
-
-        # 8. Reordenar columnas para mejor organización
-        preferred_order = [
-            'Date', 'Year', 'Month', 'Day', 'DayOfWeek', 'Label', 'Sentiment',
-            'ValidTitles', 'AvgTitleLength', 'FinancialKeywords', 'PositiveKeywords', 'NegativeKeywords'
-        ] + news_columns + ['AllTitles']
+    def clean(self, verbose=True, seen_keys=None, columns=None):
+        """Limpiar y transformar el DataFrame con las etapas de transform/stages.py (solo las que producen columns)"""
+        log = print if verbose else (lambda *args, **kwargs: None)
+        source = self.df
+        requested = columns if columns is not None else self.config.TRANSFORM_COLUMNS
+        context = {
+            'news_columns': [col for col in source.columns if col.startswith('Top')],
+            'keyword_columns': list(self.keyword_matcher.lexicons),
+            'keyword_matcher': self.keyword_matcher,
+            'use_arrow_strings': self.config.USE_ARROW_STRINGS,
+            'intern_headlines': self.config.INTERN_HEADLINES,
+            'log': log,
+        }
+        stages = plan_stages(requested, context)
+        log("🧹 Iniciando transformación de datos de análisis de sentimiento...")
+        skipped = [name for name in STAGES if name not in {stage.name for stage in stages}]
+        if skipped:
+            log(f"⏭️ Etapas omitidas (sus columnas no se pidieron): {', '.join(skipped)}")
         
-        # Mantener solo las columnas que existen
-        ordered_cols = [c for c in preferred_order if c in df.columns]
-        other_cols = [c for c in df.columns if c not in ordered_cols]
-        df = df[ordered_cols + other_cols]
+        # 1. Etapas sobre todas las filas: fechas y etiquetas (Series sin copiar)
+        data = dict(source.items())
+        key_stages = [stage for stage in stages if stage.phase == 'keys']
+        self._run_waves(key_stages, data, context, len(source))
+        key_columns = {col for stage in key_stages for col in stage.resolve(stage.outputs, context)}
 
-        # 9. Resetear índice
-        df = df.reset_index(drop=True)
+        # 2. Duplicados y faltantes: solo se marcan, las filas se filtran una vez
+        with self.profiler.stage('transform.filas', rows=len(source)):
+            keep = self._rows_to_keep(data, seen_keys, log)
+        rows = int(keep.sum())
+
+        # 3. Etapas por fila (texto) solo sobre las filas conservadas
+        row_stages = [stage for stage in stages if stage.phase == 'rows']
+        if 'titulos' in {stage.name for stage in row_stages}:
+            log(f"📰 Procesando {len(context['news_columns'])} columnas de noticias...")
+        row_inputs = {col for stage in row_stages for col in stage.resolve(stage.inputs, context)}
+        frame = source.loc[keep, [col for col in source.columns if col in row_inputs and col not in key_columns]]
+        derived = [col for col in row_inputs if col in key_columns]
+        if derived:
+            frame = frame.assign(**{col: data[col][keep] for col in derived})
+        produced = self._run_row_stages(row_stages, frame, context, log)
+
+        # 4. Armar el resultado en el orden final, con índice 0..n-1 y sin copiar el texto
+        available = {col: data[col] for col in key_columns}
+        available.update({col: source[col] for col in source.columns
+                          if col not in available and col not in context['news_columns']})
+        ordered = PREFERRED_ORDER + context['news_columns'] + ['AllTitles']
+        order = [col for col in ordered if col in available or col in produced]
+        order += [col for col in list(available) + list(produced) if col not in order]
+        if requested is not None:
+            order = [col for col in order if col in requested]
+        elif self.config.LAZY_ALL_TITLES and 'AllTitles' in order:
+            # El texto combinado no se guarda: se reconstruye con join_titles() donde se necesite
+            order.remove('AllTitles')
+        with self.profiler.stage('transform.ensamblar', rows=rows):
+            df = pd.DataFrame(
+                {col: (produced[col] if col in produced else available[col][keep]).array for col in order},
+                index=pd.RangeIndex(rows), copy=False)
+
+        # 5. Tipos compactos: categóricas, enteros reducidos y texto en pyarrow
+        if self.config.COMPACT_DTYPES:
+            with self.profiler.stage('transform.tipos', rows=rows):
+                before = column_memory(df)
+                if 'AllTitles' not in df.columns and 'AllTitles' in produced:
+                    # El informe incluye AllTitles aunque no se materialice, para reflejar también ese ahorro
+                    before = pd.concat([before, column_memory(produced[['AllTitles']])])
+                df = compact_dtypes(df, keyword_columns=context['keyword_columns'])
+                self.memory_report = memory_report(before, column_memory(df))
+            if verbose:
+                print_memory_report(self.memory_report)
         
-        print(f"✅ Transformación completada. Registros finales: {len(df)}")
-        print(f"📊 Estadísticas finales:")
-        print(f"   - Rango de fechas: {df['Date'].min()} a {df['Date'].max()}")
-        print(f"   - Sentimientos: {df['Sentiment'].value_counts().to_dict()}")
-        print(f"   - Títulos válidos promedio por día: {df['ValidTitles'].mean():.1f}")
+        log(f"✅ Transformación completada. Registros finales: {len(df)}")
+        log(f"📊 Estadísticas finales:")
+        if 'Date' in df.columns:
+            log(f"   - Rango de fechas: {df['Date'].min()} a {df['Date'].max()}")
+        if 'Sentiment' in df.columns:
+            log(f"   - Sentimientos: {df['Sentiment'].value_counts().to_dict()}")
+        if 'ValidTitles' in df.columns:
+            log(f"   - Títulos válidos promedio por día: {df['ValidTitles'].mean():.1f}")
         
         self.df = df
+        self.rows_transformed = len(df)
         return self.df
+
+    def _rows_to_keep(self, data, seen_keys, log):
+        """Máscara de filas sin (Date, Label) repetido, ya visto en lotes anteriores ni incompleto"""
+        keys = pd.DataFrame({'Date': data['Date'], 'Label': data['Label']})
+        keep = ~keys.duplicated().to_numpy()
+        if seen_keys is not None:
+            # Solo las claves completas importan: las incompletas se descartan abajo
+            complete = keep & keys.notna().all(axis=1).to_numpy()
+            keep[complete] = seen_keys.add_new(keys['Date'][complete], keys['Label'][complete].astype(np.int64))
+        duplicates_removed = len(keys) - int(keep.sum())
+        if duplicates_removed > 0:
+            log(f"🔄 Duplicados eliminados: {duplicates_removed}")
+
+        # Eliminar filas con datos críticos faltantes
+        incomplete = keep & keys.isna().any(axis=1).to_numpy()
+        keep &= ~incomplete
+        if incomplete.any():
+            log(f"❌ Filas eliminadas por datos faltantes: {int(incomplete.sum())}")
+        return keep
+
+    def _run_stage(self, stage, data, context, rows):
+        with self.profiler.stage(f'transform.{stage.name}', rows=rows):
+            return stage.run(data, context)
+
+    def _run_waves(self, stages, data, context, rows):
+        """Ejecutar las etapas por tandas de etapas independientes; con TRANSFORM_STAGE_THREADS > 1,
+        las de una misma tanda corren a la vez en hilos. Agrega sus salidas a data."""
+        threads = self.config.TRANSFORM_STAGE_THREADS
+        for wave in stage_waves(stages, context):
+            if threads > 1 and len(wave) > 1:
+                with ThreadPoolExecutor(max_workers=min(threads, len(wave))) as executor:
+                    results = list(executor.map(self._run_stage, wave, repeat(data), repeat(context), repeat(rows)))
+            else:
+                results = [self._run_stage(stage, data, context, rows) for stage in wave]
+            for produced in results:
+                data.update(produced)
+
+    def _run_row_stages(self, stages, frame, context, log):
+        """Ejecutar las etapas por fila en este proceso o repartidas por rangos de filas entre procesos"""
+        workers = self.config.TRANSFORM_WORKERS
+        if not stages:
+            return pd.DataFrame(index=frame.index)
+        if workers <= 1 or len(frame) < 2 * workers:
+            data = dict(frame.items())
+            self._run_waves(stages, data, dict(context, index=frame.index), len(frame))
+            outputs = [col for stage in stages for col in stage.resolve(stage.outputs, context)]
+            return pd.DataFrame({col: data[col] for col in dict.fromkeys(outputs)}, index=frame.index, copy=False)
+
+        bounds = np.linspace(0, len(frame), workers + 1, dtype=int)
+        partitions = [frame.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        log(f"⚡ Etapas de texto en paralelo: {len(partitions)} particiones en {workers} procesos")
+        # El log no se envía a los procesos: las etapas por fila no imprimen
+        args = (partitions, repeat(stages), repeat({key: value for key, value in context.items() if key != 'log'}))
+        with self.profiler.stage('transform.' + '+'.join(stage.name for stage in stages), rows=len(frame)):
+            if self._executor is not None:
+                return pd.concat(self._executor.map(run_row_stages, *args))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return pd.concat(executor.map(run_row_stages, *args))
+
+    def clean_chunks(self, chunks, columns=None):
+        """Transformar un flujo de lotes, deduplicando (Date, Label) entre lotes"""
+        seen_keys = SeenKeys()
+        total_rows = 0
+        # Un único pool de procesos para todos los lotes
+        if self.config.TRANSFORM_WORKERS > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.config.TRANSFORM_WORKERS)
+        try:
+            for chunk in chunks:
+                self.df = chunk
+                cleaned = self.clean(verbose=False, seen_keys=seen_keys, columns=columns)
+                total_rows += len(cleaned)
+                yield cleaned
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        self.rows_transformed = total_rows
+        print(f"✅ Transformación por lotes completada. Registros finales: {total_rows}")
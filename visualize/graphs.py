@@ -0,0 +1,339 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')  # Solo se guardan archivos: backend sin interfaz, también en los procesos hijos
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib import cbook
+from matplotlib.figure import Figure
+
+POSITIVE_NEGATIVE_COLORS = ['#ff6b6b', '#4ecdc4']
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+KEYWORD_COLUMNS = ['FinancialKeywords', 'PositiveKeywords', 'NegativeKeywords']
+
+# Gráficas que no se guardan (la 4 estaba desactivada en el script original)
+SKIPPED_GRAPHS = {'04_analisis_palabras_clave'}
+
+
+def _style():
+    """Estilo común de todas las figuras (equivale a sns.set_style + rcParams globales)"""
+    return matplotlib.rc_context({**sns.axes_style('whitegrid'), 'font.size': 10})
+
+
+def _box_stats(df, column):
+    """Estadísticas de boxplot por sentimiento, calculadas una vez sobre todas las filas"""
+    stats = []
+    for sentiment, values in df.groupby('Sentiment', observed=True)[column]:
+        group_stats = cbook.boxplot_stats(values.dropna().to_numpy())[0]
+        group_stats['label'] = sentiment
+        stats.append(group_stats)
+    return stats
+
+
+def _downsample(df, max_points, seed=0):
+    """Muestra aleatoria de como máximo max_points filas (None o 0 desactiva el muestreo)"""
+    if max_points and len(df) > max_points:
+        return df.sample(n=max_points, random_state=seed).sort_index()
+    return df
+
+
+def aggregate_graph_inputs(df, max_scatter_points=None):
+    """Reducir el DataFrame a los agregados pequeños que dibuja cada gráfica.
+
+    Devuelve {nombre_de_archivo_sin_extensión: (función, datos)}; solo
+    incluye las gráficas cuyas columnas existen y que no están en
+    SKIPPED_GRAPHS. Los datos son pequeños y se pueden enviar a otro proceso
+    sin copiar el DataFrame completo.
+    """
+    columns = set(df.columns)
+    inputs = {}
+
+    def wanted(name, required):
+        # Las gráficas de SKIPPED_GRAPHS no se calculan
+        return name not in SKIPPED_GRAPHS and set(required).issubset(columns)
+
+    # Gráfica 1: Distribución de sentimientos por año
+    if wanted('01_distribucion_sentimientos_por_anio', {'Year', 'Sentiment'}):
+        inputs['01_distribucion_sentimientos_por_anio'] = (
+            render_sentiment_by_year, df.groupby(['Year', 'Sentiment'], observed=True).size().unstack(fill_value=0))
+
+    # Gráfica 2: Sentimientos por día de la semana
+    if wanted('02_sentimientos_por_dia_semana', {'DayOfWeek', 'Sentiment'}):
+        df_clean = df[df['DayOfWeek'].isin(DAY_ORDER)]
+        crosstab = pd.crosstab(df_clean['DayOfWeek'], df_clean['Sentiment']).reindex(DAY_ORDER)
+        inputs['02_sentimientos_por_dia_semana'] = (render_sentiment_by_weekday, crosstab)
+
+    # Gráfica 3: Evolución temporal del sentimiento
+    if wanted('03_evolucion_temporal_sentimiento', {'Date', 'Label'}):
+        df_temp = df[['Date', 'Label']].sort_values('Date')
+        dates = pd.to_datetime(df_temp['Date'])
+        labels = df_temp['Label'].astype(float)
+        # Media móvil de 30 días sobre todas las filas; la línea se dibuja con un punto de cada `step`
+        moving_average = pd.Series(labels.rolling(window=30, min_periods=1).mean().to_numpy(),
+                                   index=pd.DatetimeIndex(dates))
+        if max_scatter_points and len(moving_average) > max_scatter_points:
+            step = -(-len(moving_average) // max_scatter_points)
+            moving_average = moving_average.iloc[::step]
+        monthly_sentiment = labels.groupby(dates.dt.to_period('M')).mean()
+        inputs['03_evolucion_temporal_sentimiento'] = (
+            render_sentiment_over_time, (moving_average, monthly_sentiment))
+
+    # Gráfica 4: Análisis de palabras clave por sentimiento
+    if wanted('04_analisis_palabras_clave', {'Sentiment', *KEYWORD_COLUMNS}):
+        keyword_means = df.groupby('Sentiment', observed=True)[KEYWORD_COLUMNS].mean()
+        inputs['04_analisis_palabras_clave'] = (render_keywords, {
+            'means': keyword_means,
+            'financial_box': _box_stats(df, 'FinancialKeywords'),
+            'correlation': df[KEYWORD_COLUMNS].corr(),
+        })
+
+    # Gráfica 5: Análisis de longitud de títulos y cantidad de noticias
+    if wanted('05_analisis_titulos_noticias', {'Sentiment', 'AvgTitleLength', 'ValidTitles'}):
+        yearly_titles = None
+        if 'Year' in columns:
+            yearly_titles = df.groupby(['Year', 'Sentiment'], observed=True)['ValidTitles'].mean().unstack(fill_value=0)
+        scatter = _downsample(df[['ValidTitles', 'AvgTitleLength', 'Sentiment']], max_scatter_points)
+        inputs['05_analisis_titulos_noticias'] = (render_titles, {
+            'length_box': _box_stats(df, 'AvgTitleLength'),
+            'valid_box': _box_stats(df, 'ValidTitles'),
+            'scatter': scatter,
+            'yearly_titles': yearly_titles,
+        })
+
+    return inputs
+
+
+def _save(fig, path, dpi):
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    return path
+
+
+def render_sentiment_by_year(sentiment_year, path, dpi):
+    with _style():
+        fig = Figure(figsize=(14, 8))
+        ax = fig.add_subplot()
+        sentiment_year.plot(kind='bar', stacked=True, color=POSITIVE_NEGATIVE_COLORS, ax=ax)
+        ax.set_title('Distribución de Sentimientos por Año', fontsize=16, fontweight='bold')
+        ax.set_xlabel('Año', fontsize=12)
+        ax.set_ylabel('Número de Registros', fontsize=12)
+        ax.legend(title='Sentimiento', bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax.tick_params(axis='x', labelrotation=45)
+        return _save(fig, path, dpi)
+
+
+def render_sentiment_by_weekday(crosstab, path, dpi):
+    with _style():
+        fig = Figure(figsize=(12, 8))
+        ax = fig.add_subplot()
+        crosstab.plot(kind='bar', stacked=True, color=POSITIVE_NEGATIVE_COLORS, ax=ax)
+        ax.set_title('Distribución de Sentimientos por Día de la Semana', fontsize=16, fontweight='bold')
+        ax.set_xlabel('Día de la Semana', fontsize=12)
+        ax.set_ylabel('Número de Registros', fontsize=12)
+        ax.legend(title='Sentimiento', bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax.tick_params(axis='x', labelrotation=45)
+        return _save(fig, path, dpi)
+
+
+def render_sentiment_over_time(data, path, dpi):
+    moving_average, monthly_sentiment = data
+    with _style():
+        fig = Figure(figsize=(16, 8))
+        ax_top, ax_bottom = fig.subplots(2, 1)
+
+        ax_top.plot(moving_average.index, moving_average.to_numpy(), linewidth=2, color='#2E86AB')
+        ax_top.set_title('Evolución del Sentimiento (Media Móvil 30 días)', fontsize=14, fontweight='bold')
+        ax_top.set_ylabel('Sentimiento Promedio', fontsize=12)
+        ax_top.grid(True, alpha=0.3)
+
+        # Distribución mensual
+        monthly_sentiment.plot(kind='line', marker='o', color='#A23B72', ax=ax_bottom)
+        ax_bottom.set_title('Sentimiento Promedio por Mes', fontsize=14, fontweight='bold')
+        ax_bottom.set_xlabel('Fecha', fontsize=12)
+        ax_bottom.set_ylabel('Sentimiento Promedio', fontsize=12)
+        ax_bottom.grid(True, alpha=0.3)
+        ax_bottom.tick_params(axis='x', labelrotation=45)
+        return _save(fig, path, dpi)
+
+
+def render_keywords(data, path, dpi):
+    with _style():
+        fig = Figure(figsize=(14, 10))
+        axes = fig.subplots(2, 2)
+
+        # Gráfico de calor
+        sns.heatmap(data['means'].T, annot=True, cmap='RdYlBu_r', fmt='.2f',
+                    cbar_kws={'label': 'Promedio de Palabras'}, ax=axes[0, 0])
+        axes[0, 0].set_title('Promedio de Palabras Clave por Sentimiento', fontsize=12, fontweight='bold')
+        axes[0, 0].set_xlabel('Sentimiento')
+        axes[0, 0].set_ylabel('Tipo de Palabras')
+
+        # Distribución de palabras financieras
+        axes[0, 1].bxp(data['financial_box'])
+        axes[0, 1].set_title('Distribución de Palabras Financieras', fontsize=12, fontweight='bold')
+        axes[0, 1].set_xlabel('Sentimiento')
+        axes[0, 1].set_ylabel('Número de Palabras Financieras')
+
+        # Distribución de palabras positivas vs negativas
+        data['means'][['PositiveKeywords', 'NegativeKeywords']].plot(
+            kind='bar', color=['#4ecdc4', '#ff6b6b'], ax=axes[1, 0])
+        axes[1, 0].set_title('Palabras Positivas vs Negativas por Sentimiento', fontsize=12, fontweight='bold')
+        axes[1, 0].set_xlabel('Sentimiento')
+        axes[1, 0].set_ylabel('Promedio de Palabras')
+        axes[1, 0].legend(['Positivas', 'Negativas'])
+        axes[1, 0].tick_params(axis='x', labelrotation=0)
+
+        # Correlación entre tipos de palabras
+        sns.heatmap(data['correlation'], annot=True, cmap='coolwarm', center=0, fmt='.2f', ax=axes[1, 1])
+        axes[1, 1].set_title('Correlación entre Tipos de Palabras', fontsize=12, fontweight='bold')
+        return _save(fig, path, dpi)
+
+
+def render_titles(data, path, dpi):
+    with _style():
+        fig = Figure(figsize=(16, 8))
+        axes = fig.subplots(2, 2)
+
+        # Longitud promedio de títulos por sentimiento
+        axes[0, 0].bxp(data['length_box'])
+        axes[0, 0].set_title('Distribución de Longitud Promedio de Títulos', fontsize=12, fontweight='bold')
+        axes[0, 0].set_xlabel('Sentimiento')
+        axes[0, 0].set_ylabel('Longitud Promedio de Títulos')
+
+        # Cantidad de títulos válidos por sentimiento
+        axes[0, 1].bxp(data['valid_box'])
+        axes[0, 1].set_title('Distribución de Títulos Válidos por Día', fontsize=12, fontweight='bold')
+        axes[0, 1].set_xlabel('Sentimiento')
+        axes[0, 1].set_ylabel('Número de Títulos Válidos')
+
+        # Relación entre longitud y cantidad de títulos (muestra si hay demasiados puntos)
+        sns.scatterplot(data=data['scatter'], x='ValidTitles', y='AvgTitleLength', hue='Sentiment',
+                        alpha=0.6, ax=axes[1, 0])
+        axes[1, 0].set_title('Relación entre Títulos Válidos y Longitud Promedio', fontsize=12, fontweight='bold')
+        axes[1, 0].set_xlabel('Número de Títulos Válidos')
+        axes[1, 0].set_ylabel('Longitud Promedio de Títulos')
+
+        # Distribución temporal de títulos válidos
+        if data['yearly_titles'] is not None:
+            data['yearly_titles'].plot(kind='line', marker='o', color=POSITIVE_NEGATIVE_COLORS, ax=axes[1, 1])
+            axes[1, 1].set_title('Promedio de Títulos Válidos por Año', fontsize=12, fontweight='bold')
+            axes[1, 1].set_xlabel('Año')
+            axes[1, 1].set_ylabel('Promedio de Títulos Válidos')
+            axes[1, 1].legend(title='Sentimiento')
+        return _save(fig, path, dpi)
+
+
+def _source_digest():
+    """Huella del código fuente de este módulo: cualquier cambio en las funciones de dibujo,
+    _save, _style o las constantes invalida la caché"""
+    return hashlib.sha256(inspect.getsource(sys.modules[__name__]).encode('utf-8')).hexdigest()
+
+
+def _canonical_frame(frame):
+    """DataFrame con números en float64 y el resto como texto, índice incluido: los mismos agregados
+    dan la misma huella aunque vengan del DataFrame en memoria (Int64, categóricas) o del CSV releído"""
+    def canonical(values):
+        values = pd.Series(values)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(values.cat.categories.dtype)
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            return values.astype('float64').to_numpy()
+        return values.astype(str).to_numpy()
+    columns = {f'c{i}': canonical(frame.iloc[:, i]) for i in range(frame.shape[1])}
+    columns.update({f'i{level}': canonical(frame.index.get_level_values(level))
+                    for level in range(frame.index.nlevels)})
+    return pd.DataFrame(columns), [str(col) for col in frame.columns]
+
+
+def _update_digest(digest, value):
+    """Agregar a la huella un valor de los agregados (DataFrame, Series, arreglo, dict, lista o escalar)"""
+    if isinstance(value, pd.Series):
+        value = value.to_frame()
+    if isinstance(value, pd.DataFrame):
+        canonical, columns = _canonical_frame(value)
+        digest.update(json.dumps(['frame', columns]).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(canonical, index=False).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        _update_digest(digest, pd.Series(value.ravel()))
+    elif isinstance(value, dict):
+        for key in sorted(value, key=str):
+            digest.update(json.dumps(['key', str(key)]).encode('utf-8'))
+            _update_digest(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(json.dumps(['list', len(value)]).encode('utf-8'))
+        for item in value:
+            _update_digest(digest, item)
+    elif isinstance(value, (bool, int, float, np.number)):
+        digest.update(json.dumps(['number', float(value)]).encode('utf-8'))
+    else:
+        digest.update(json.dumps(['value', str(value)]).encode('utf-8'))
+
+
+def _input_hash(render, data, image_format, dpi, source_digest):
+    """Huella de los valores de los agregados de una gráfica, de sus parámetros y del código que la dibuja"""
+    digest = hashlib.sha256()
+    _update_digest(digest, data)
+    digest.update(f'{image_format}:{dpi}:{render.__module__}.{render.__qualname__}:{source_digest}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _read_cache(cache_path):
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(cache_path, cache):
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"⚠️ No se pudo guardar la caché de gráficas: {e}")
+
+
+def render_graphs(inputs, graph_dir, image_format='png', dpi=300, workers=1, cache_path=None):
+    """Dibujar y guardar cada gráfica; con workers > 1 cada figura se dibuja en un proceso aparte.
+
+    Con cache_path, las gráficas cuyo archivo existe y cuyos agregados y
+    parámetros no cambiaron desde la última ejecución no se vuelven a dibujar.
+    """
+    cache = _read_cache(cache_path)
+    source_digest = _source_digest() if cache_path else None
+    paths, jobs, hashes = [], [], {}
+    for name, (render, data) in inputs.items():
+        path = os.path.join(graph_dir, f'{name}.{image_format}')
+        paths.append(path)
+        if cache_path:
+            hashes[path] = _input_hash(render, data, image_format, dpi, source_digest)
+            if cache.get(path) == hashes[path] and os.path.exists(path):
+                continue
+        jobs.append((render, data, path))
+
+    if workers <= 1 or len(jobs) <= 1:
+        for render, data, path in jobs:
+            render(data, path, dpi)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            futures = [executor.submit(render, data, path, dpi) for render, data, path in jobs]
+            for future in futures:
+                future.result()
+
+    if cache_path:
+        hits = len(paths) - len(jobs)
+        print(f"🗂️ Caché de gráficas: {hits} sin cambios (omitidas), {len(jobs)} dibujadas")
+        cache.update(hashes)
+        _write_cache(cache_path, cache)
+    return paths